@@ -6,7 +6,7 @@ import uuid
 from lib.data import Leg
 from typing import Optional
 
-def athena(sql: str) -> pd.DataFrame:
+def athena(sql: str, boto3_session=None) -> pd.DataFrame:
     """Single path for all Athena queries against the S3 Tables catalog."""
     return wr.athena.read_sql_query(
         sql=sql,
@@ -14,7 +14,8 @@ def athena(sql: str) -> pd.DataFrame:
         workgroup=WORKGROUP,
         data_source=CATALOG,   # IMPORTANT: non-AwsDataCatalog
         s3_output=S3_OUTPUT,
-        ctas_approach=False    # REQUIRED when data_source != AwsDataCatalog
+        ctas_approach=False,   # REQUIRED when data_source != AwsDataCatalog
+        boto3_session=boto3_session,  # None = boto3's default session
     )
 
 def fetch_quotes_at_exit(df_entry: pd.DataFrame, debug_keep_tmp: bool = False) -> pd.DataFrame:
@@ -228,15 +229,16 @@ def query_ticker(
     
 
 
-def query_entries_range_for_leg(
+def leg_entries_sql(
     ts_start: str,
     ts_end: str,
     ticker: str,
     leg: Leg,
     mode: str = "nearest",
-) -> pd.DataFrame:
+) -> str:
     """
-    Resolve one Leg (delta + DTE) into concrete contracts across [ts_start, ts_end).
+    Athena SQL resolving one Leg (delta + DTE) to a concrete contract per day in
+    [ts_start, ts_end); see query_entries_range_for_leg.
     """
     cp = "C" if leg.opt_type.name == "CALL" else "P"
     delta_mag = float(leg.strike_delta) / 100.0
@@ -294,9 +296,32 @@ def query_entries_range_for_leg(
     WHERE rn = 1
     ORDER BY entry_date;
     """
-    print(sql)
+    return sql
 
-    df = athena(sql)
+
+def query_entries_range_for_leg(
+    ts_start: str,
+    ts_end: str,
+    ticker: str,
+    leg: Leg,
+    mode: str = "nearest",
+    boto3_session=None,
+    verbose: bool = True,
+) -> pd.DataFrame:
+    """
+    Resolve one Leg (delta + DTE) into concrete contracts across [ts_start, ts_end).
+    Pass a boto3_session of its own when calling from a worker thread.
+    """
+    cp = "C" if leg.opt_type.name == "CALL" else "P"
+    delta_mag = float(leg.strike_delta) / 100.0
+    delta_target = delta_mag if cp == "C" else -delta_mag
+    horizon_days = int(leg.dte)
+
+    sql = leg_entries_sql(ts_start, ts_end, ticker, leg, mode)
+    if verbose:
+        print(sql)
+
+    df = athena(sql, boto3_session=boto3_session)
 
     # Normalize dates
     for col in ("entry_date", "expiry"):
@@ -309,7 +334,8 @@ def query_entries_range_for_leg(
     df["leg_quantity"] = leg.quantity
     df["target_delta"] = delta_target
     df["target_dte"] = horizon_days
-    print(df)
+    if verbose:
+        print(df)
     return df
 
 def fetch_expiry_quotes(df_entry: pd.DataFrame) -> pd.DataFrame:
@@ -1,6 +1,8 @@
 import math
 from typing import Literal, Optional
 
+import numpy as np
+
 OptionType = Literal["call", "put"]
 
 def _norm_cdf(x: float) -> float:
@@ -81,3 +83,54 @@ def implied_vol(
         else:
             lo, f_lo = mid, f_mid
     return 0.5 * (lo + hi)
+
+
+def _bs_price_vec(S, K, T, r, q, sigma, is_call, ndtr):
+    sqT = np.sqrt(T)
+    d1 = (np.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / (sigma * sqT)
+    d2 = d1 - sigma * sqT
+    disc_r = np.exp(-r * T)
+    disc_q = np.exp(-q * T)
+    call = S * disc_q * ndtr(d1) - K * disc_r * ndtr(d2)
+    put = K * disc_r * ndtr(-d2) - S * disc_q * ndtr(-d1)
+    return np.where(is_call, call, put)
+
+def implied_vols(
+    price, S, K, T, r=0.0, q=0.0,
+    opt_type="call",
+    tol: float = 1e-8,
+    max_iter: int = 100,
+    sigma_lo: float = 1e-4,
+    sigma_hi: float = 5.0,
+) -> np.ndarray:
+    """
+    Vectorized implied_vol: every argument broadcasts (opt_type may be an array of
+    "call"/"put"). Runs one bisection across all quotes at once; NaN where the price
+    is not bracketed by [sigma_lo, sigma_hi].
+    """
+    # Imported here so the scalar functions above don't pull in scipy.
+    from scipy.special import ndtr
+
+    price, S, K, T, r, q = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.float64) for x in (price, S, K, T, r, q))
+    )
+    is_call = np.broadcast_to(np.asarray(opt_type) == "call", price.shape)
+
+    lo = np.full(price.shape, sigma_lo)
+    hi = np.full(price.shape, sigma_hi)
+    f_lo = _bs_price_vec(S, K, T, r, q, lo, is_call, ndtr) - price
+    f_hi = _bs_price_vec(S, K, T, r, q, hi, is_call, ndtr) - price
+    bracketed = f_lo * f_hi <= 0
+
+    for _ in range(max_iter):
+        mid = 0.5 * (lo + hi)
+        f_mid = _bs_price_vec(S, K, T, r, q, mid, is_call, ndtr) - price
+        # keep the root bracketed
+        left = f_lo * f_mid <= 0
+        hi = np.where(left, mid, hi)
+        lo = np.where(left, lo, mid)
+        f_lo = np.where(left, f_lo, f_mid)
+        if np.all(hi - lo < tol):
+            break
+
+    return np.where(bracketed, 0.5 * (lo + hi), np.nan)
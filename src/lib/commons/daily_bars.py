@@ -0,0 +1,34 @@
+from typing import Any, Dict, List
+from lib.tradier.tradier_client_wrapper import TradierClient
+from lib.commons.ttl_cache import async_ttl_cache
+
+
+# Daily candles only change once a day; the TTL just bounds staleness in a long
+# session. Identical (symbol, start, end) requests share one fetch, e.g. the two
+# sma_trending_up_trading_days calls in a SEPA check.
+@async_ttl_cache(ttl=300, ignore=("tradier",))
+async def get_daily_bars(
+    tradier: TradierClient,
+    symbol: str,
+    start: str,   # YYYY-MM-DD
+    end: str,     # YYYY-MM-DD
+) -> List[Dict[str, Any]]:
+    """
+    Daily candles from Tradier /markets/history, oldest first. Empty list if none.
+    The returned list is shared between callers; do not mutate it.
+    """
+    payload: Dict[str, Any] = await tradier.get_json(
+        "/markets/history",
+        params={"symbol": symbol, "start": start, "end": end},
+    )
+
+    history = (payload or {}).get("history") or {}
+    days = history.get("day")
+    if not days:
+        return []
+
+    # Tradier sometimes returns a dict for a single day
+    if isinstance(days, dict):
+        days = [days]
+
+    return sorted(days, key=lambda d: d.get("date", ""))
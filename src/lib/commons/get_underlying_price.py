@@ -24,6 +24,34 @@ async def get_underlying_price(
         if not q:
             return None
 
+    return _quote_price(q)
+
+
+# Symbols per /markets/quotes request; keeps the query string a sane length.
+QUOTE_BATCH_SIZE = 100
+
+
+async def get_underlying_prices(
+    tickers: List[str],
+    *,
+    client: TradierClient,
+) -> Dict[str, Optional[float]]:
+    """
+    get_underlying_price for many tickers, QUOTE_BATCH_SIZE symbols per request
+    instead of one round trip each. Unknown symbols map to None.
+    """
+    prices: Dict[str, Optional[float]] = {t: None for t in tickers}
+    for i in range(0, len(tickers), QUOTE_BATCH_SIZE):
+        batch = tickers[i:i + QUOTE_BATCH_SIZE]
+        data = await client.get_json("/markets/quotes", params={"symbols": ",".join(batch)})
+        q = ((data or {}).get("quotes") or {}).get("quote") or []
+        for quote in (q if isinstance(q, list) else [q]):
+            if quote.get("symbol") in prices:
+                prices[quote["symbol"]] = _quote_price(quote)
+    return prices
+
+
+def _quote_price(q: Dict[str, Any]) -> Optional[float]:
     bid = q.get("bid")
     ask = q.get("ask")
     last = q.get("last")
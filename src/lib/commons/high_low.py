@@ -1,6 +1,7 @@
 from datetime import date, timedelta
 from typing import Any, Dict, Optional, List
 from lib.tradier.tradier_client_wrapper import TradierClient
+from lib.commons.daily_bars import get_daily_bars
 from dataclasses import dataclass
 from typing import Optional
 
@@ -37,28 +38,32 @@ async def get_52w_high_low(
         "end": end.isoformat(),
     }
 
-    payload: Dict[str, Any] = await tradier.get_json(
-        "/markets/history",
-        params=params,
-    )
+    days = await get_daily_bars(tradier, params["symbol"], params["start"], params["end"])
+    return high_low_from_bars(params["symbol"], days, params["start"], params["end"])
+
 
-    history = (payload or {}).get("history") or {}
-    days = history.get("day")
+def high_low_from_bars(
+    sym: str,
+    days: List[Dict[str, Any]],
+    start: str,   # YYYY-MM-DD
+    end: str,     # YYYY-MM-DD
+) -> FiftyTwoWeekRange:
+    """
+    High/low over the candles dated within [start, end] from an already-fetched list,
+    so a longer history request can be reused for the 52-week range.
+    """
+    days = [d for d in days if start <= d.get("date", "") <= end]
 
     if not days:
         return FiftyTwoWeekRange(
-            symbol=params["symbol"],
-            start=start.isoformat(),
-            end=end.isoformat(),
+            symbol=sym,
+            start=start,
+            end=end,
             high_52w=None,
             low_52w=None,
             days_used=0,
         )
 
-    # Single-day edge case
-    if isinstance(days, dict):
-        days = [days]
-
     highs: List[float] = []
     lows: List[float] = []
 
@@ -72,18 +77,18 @@ async def get_52w_high_low(
 
     if not highs or not lows:
         return FiftyTwoWeekRange(
-            symbol=params["symbol"],
-            start=start.isoformat(),
-            end=end.isoformat(),
+            symbol=sym,
+            start=start,
+            end=end,
             high_52w=None,
             low_52w=None,
             days_used=0,
         )
 
     return FiftyTwoWeekRange(
-        symbol=params["symbol"],
-        start=start.isoformat(),
-        end=end.isoformat(),
+        symbol=sym,
+        start=start,
+        end=end,
         high_52w=max(highs),
         low_52w=min(lows),
         days_used=min(len(highs), len(lows)),
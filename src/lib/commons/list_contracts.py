@@ -1,7 +1,10 @@
-from typing import Optional, List, Dict, Any
+from array import array
+from bisect import bisect_left
+from typing import Optional, List, Dict, Any, NamedTuple, Tuple
 import aiohttp
 import os
 from lib.tradier.tradier_client_wrapper import TradierClient
+from lib.commons.ttl_cache import async_ttl_cache
 
 TRADIER_API_KEY = os.getenv("TRADIER_API_KEY")
 TRADIER_ENDPOINT = "https://api.tradier.com/v1"
@@ -10,6 +13,17 @@ TRADIER_REQUEST_HEADERS = {
     "Accept": "application/json"
 }
 
+
+class ContractsBySide(NamedTuple):
+    """Calls and puts sorted by strike, each with a parallel strike array for bisect."""
+    calls: List[Dict[str, Any]]
+    puts: List[Dict[str, Any]]
+    call_strikes: array
+    put_strikes: array
+
+
+# Quotes move on a seconds timescale; 30s lets overlapping scans share a chain fetch.
+@async_ttl_cache(ttl=30)
 async def list_contracts_for_expiry(
     symbol: str,
     expiration: str,                  # 'YYYY-MM-DD'
@@ -18,11 +32,17 @@ async def list_contracts_for_expiry(
     include_greeks: bool = True,
     min_strike: Optional[float] = None,
     max_strike: Optional[float] = None,
+    fields: Optional[Tuple[str, ...]] = None,
     client: TradierClient,
 ) -> List[Dict[str, Any]]:
     """
     Return a normalized list of option contracts for the given symbol+expiration
     from Tradier /markets/options/chains.
+
+    If `fields` is given, each contract carries only those keys (strike still
+    converted to float) instead of the full normalized record.
+
+    `mid` is (bid + ask) / 2 as a float, or None without a two-sided quote.
     """
     params = {
         "symbol": symbol,
@@ -54,6 +74,24 @@ async def list_contracts_for_expiry(
             if o.get("strike") is not None and float(o["strike"]) <= max_strike
         ]
 
+    # Sort by strike, then calls before puts
+    options.sort(key=lambda o: (
+        float(o["strike"]) if o.get("strike") is not None else float("inf"),
+        0 if o.get("option_type") == "call" else 1
+    ))
+
+    if fields is not None:
+        projected: List[Dict[str, Any]] = []
+        want_mid = "mid" in fields
+        for o in options:
+            row = {k: o.get(k) for k in fields}
+            if row.get("strike") is not None:
+                row["strike"] = float(row["strike"])
+            if want_mid:
+                row["mid"] = _mid(o)
+            projected.append(row)
+        return projected
+
     # Normalize fields we commonly care about
     out: List[Dict[str, Any]] = []
     for o in options:
@@ -67,6 +105,7 @@ async def list_contracts_for_expiry(
             "underlying": o.get("underlying"),
             "bid": o.get("bid"),
             "ask": o.get("ask"),
+            "mid": _mid(o),
             "last": o.get("last"),
             "volume": o.get("volume"),
             "open_interest": o.get("open_interest"),
@@ -74,10 +113,78 @@ async def list_contracts_for_expiry(
             "ask_size": o.get("ask_size"),
             "greeks": o.get("greeks") if include_greeks else None,
         })
-
-    # Sort by strike, then calls before puts
-    out.sort(key=lambda x: (
-        x["strike"] if x["strike"] is not None else float("inf"),
-        0 if x["option_type"] == "call" else 1
-    ))
     return out
+
+
+def _mid(o: Dict[str, Any]) -> Optional[float]:
+    bid, ask = o.get("bid"), o.get("ask")
+    if bid is None or ask is None:
+        return None
+    return (float(bid) + float(ask)) / 2.0
+
+
+def partition_contracts(contracts: List[Dict[str, Any]]) -> ContractsBySide:
+    """
+    Split list_contracts_for_expiry output into calls and puts in a single pass.
+    Input order (by strike, then API order) is preserved, so bisect_left on a strike
+    array lands on the first contract listed at that strike. Contracts without a
+    strike are dropped.
+    """
+    calls: List[Dict[str, Any]] = []
+    puts: List[Dict[str, Any]] = []
+    for c in contracts:
+        if c.get("strike") is None:
+            continue
+        # Tradier already sends lowercase; only fall back to lower() for anything else.
+        side = c.get("option_type")
+        if side != "call" and side != "put":
+            side = (side or "").lower()
+        if side == "call":
+            calls.append(c)
+        elif side == "put":
+            puts.append(c)
+    return ContractsBySide(
+        calls=calls,
+        puts=puts,
+        call_strikes=array("d", (c["strike"] for c in calls)),
+        put_strikes=array("d", (c["strike"] for c in puts)),
+    )
+
+
+
+# Same TTL as the underlying chain; repeat lookups skip both the parse and the split.
+@async_ttl_cache(ttl=30)
+async def list_chain_for_expiry(
+    symbol: str,
+    expiration: str,                  # 'YYYY-MM-DD'
+    *,
+    include_greeks: bool = True,
+    fields: Optional[Tuple[str, ...]] = None,
+    client: TradierClient,
+) -> ContractsBySide:
+    """
+    list_contracts_for_expiry already split into calls and puts (see
+    partition_contracts). The result is shared between callers; do not mutate it.
+    """
+    contracts = await list_contracts_for_expiry(
+        symbol, expiration, include_greeks=include_greeks, fields=fields, client=client
+    )
+    return partition_contracts(contracts)
+
+def nearest_strike(strikes, spot: float, prefer_high: bool = True) -> Optional[float]:
+    """
+    Nearest strike to spot from an ascending sequence of strikes (repeats allowed).
+    On an exact tie between the neighbors, prefer_high picks the one above spot.
+    """
+    if not strikes:
+        return None
+    i = bisect_left(strikes, spot)
+    if i == 0:
+        return strikes[0]
+    if i == len(strikes):
+        return strikes[-1]
+    lo, hi = strikes[i - 1], strikes[i]
+    d_lo, d_hi = spot - lo, hi - spot
+    if d_hi == d_lo:
+        return hi if prefer_high else lo
+    return hi if d_hi < d_lo else lo
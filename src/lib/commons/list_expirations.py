@@ -1,7 +1,10 @@
 from typing import List
 import aiohttp
 from lib.tradier.tradier_client_wrapper import TradierClient
+from lib.commons.ttl_cache import async_ttl_cache
 
+# Listed expirations only change day to day.
+@async_ttl_cache(ttl=86400)
 async def list_expirations(
     symbol: str,
     *,
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from lib.tradier.tradier_client_wrapper import TradierClient
+from lib.commons.daily_bars import get_daily_bars
 from dataclasses import dataclass
 from datetime import date, timedelta
 from typing import Any, Dict, List, Optional
@@ -60,15 +61,28 @@ async def sma_trending_up_trading_days(
     start = end - timedelta(days=lookback_calendar_days)
 
     sym = symbol.strip().upper()
-    payload: Dict[str, Any] = await tradier.get_json(
-        "/markets/history",
-        params={"symbol": sym, "start": start.isoformat(), "end": end.isoformat()},
+    days_sorted = await get_daily_bars(tradier, sym, start.isoformat(), end.isoformat())
+    return sma_trend_from_bars(
+        sym,
+        days_sorted,
+        ma_window=ma_window,
+        lookback_trading_days=lookback_trading_days,
+        min_delta_pct=min_delta_pct,
     )
 
-    history = (payload or {}).get("history") or {}
-    days = history.get("day")
-
-    if not days:
+def sma_trend_from_bars(
+    sym: str,
+    days_sorted: List[Dict[str, Any]],
+    *,
+    ma_window: int = 200,
+    lookback_trading_days: int = 21,
+    min_delta_pct: float = 0.0,
+) -> SmaTrendResult:
+    """
+    sma_trending_up_trading_days on an already-fetched, chronological candle list
+    (e.g. from get_daily_bars), so several checks can share one history request.
+    """
+    if not days_sorted:
         return SmaTrendResult(
             symbol=sym,
             asof="",
@@ -82,13 +96,6 @@ async def sma_trending_up_trading_days(
             closes_used=0,
         )
 
-    # Single-day edge case
-    if isinstance(days, dict):
-        days = [days]
-
-    # Ensure chronological
-    days_sorted = sorted(days, key=lambda d: d.get("date", ""))
-
     closes: List[float] = []
     asof = ""
     for d in days_sorted:
@@ -201,14 +208,18 @@ async def get_sma(
         "end": end.isoformat(),
     }
 
-    payload: Dict[str, Any] = await tradier.get_json("/markets/history", params=params)
+    days_sorted = await get_daily_bars(tradier, params["symbol"], params["start"], params["end"])
+    return moving_averages_from_bars(params["symbol"], days_sorted)
 
-    history = (payload or {}).get("history") or {}
-    days = history.get("day")
 
-    if not days:
+def moving_averages_from_bars(sym: str, days_sorted: List[Dict[str, Any]]) -> MovingAverages:
+    """
+    SMA(20/50/150/200) from an already-fetched, chronological candle list; only the
+    trailing closes matter, so any window covering 200 trading days gives the same result.
+    """
+    if not days_sorted:
         return MovingAverages(
-            symbol=params["symbol"],
+            symbol=sym,
             asof="",
             sma_20=None,
             sma_50=None,
@@ -217,13 +228,6 @@ async def get_sma(
             closes_used=0,
         )
 
-    # Tradier sometimes returns a dict for a single day
-    if isinstance(days, dict):
-        days = [days]
-
-    # Ensure chronological order
-    days_sorted = sorted(days, key=lambda d: d.get("date", ""))
-
     closes: List[float] = []
     asof = ""
     for d in days_sorted:
@@ -235,7 +239,7 @@ async def get_sma(
         asof = str(dt)
 
     return MovingAverages(
-        symbol=params["symbol"],
+        symbol=sym,
         asof=asof,
         sma_20 =_sma(closes, 20),
         sma_50 =_sma(closes, 50),
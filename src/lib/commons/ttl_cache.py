@@ -0,0 +1,52 @@
+import asyncio
+import functools
+import inspect
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+
+def async_ttl_cache(ttl: float, maxsize: int = 1024, ignore: Iterable[str] = ("client",)):
+    """
+    Memoize an async function for `ttl` seconds, keyed on its bound arguments
+    (minus `ignore`, so the TradierClient session is not part of the key).
+
+    Concurrent calls for the same key share one in-flight task instead of each
+    going to the network. Failed or cancelled calls are not cached. Cached
+    values are shared between callers, so treat them as read-only.
+    """
+    ignore = frozenset(ignore)
+
+    def decorator(fn):
+        sig = inspect.signature(fn)
+        cache: "OrderedDict[tuple, tuple[float, asyncio.Future]]" = OrderedDict()
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple((k, v) for k, v in bound.arguments.items() if k not in ignore)
+
+            now = time.monotonic()
+            hit = cache.get(key)
+            if hit is not None and hit[0] > now:
+                cache.move_to_end(key)
+                return await asyncio.shield(hit[1])
+
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            cache[key] = (now + ttl, task)
+            cache.move_to_end(key)
+            while len(cache) > maxsize:
+                cache.popitem(last=False)
+
+            def _drop_failed(t):
+                if (t.cancelled() or t.exception() is not None) and cache.get(key, (None, None))[1] is t:
+                    del cache[key]
+
+            task.add_done_callback(_drop_failed)
+            return await asyncio.shield(task)
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
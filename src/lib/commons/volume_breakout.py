@@ -5,6 +5,7 @@ from datetime import date, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 import math
 import aiohttp
+import orjson
 
 
 @dataclass(frozen=True)
@@ -41,7 +42,7 @@ async def _tradier_get_json(
 ) -> Dict[str, Any]:
     async with session.get(url, headers=headers, params=params, timeout=30) as resp:
         resp.raise_for_status()
-        return await resp.json()
+        return orjson.loads(await resp.read())
 
 
 async def volume_confirmation_eod(
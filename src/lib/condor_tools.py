@@ -2,7 +2,7 @@ from lib.data.Leg import Leg, Strategy, Direction, OptionType
 import pandas as pd
 from lib.option_strat import query_entries_range_for_strategy, summarize_hold_to_maturity_strategy_from_entries, summarize_strangle_trades, summarize_put_spread_trades
 from lib.athena_lib import fetch_strangle_trades, fetch_put_spread_trades
-from lib.mysql_lib import create_study, upsert_study_detail, upsert_study_summary, upsert_strangle_study_det
+from lib.mysql_lib import create_study, upsert_study_detail, upsert_study_summary, upsert_strangle_study_det, transaction
 from datetime import datetime
 import os
 
@@ -128,10 +128,11 @@ def strangle_study(tickers, ts_start="2020-12-15", ts_end="2026-03-16", study_de
     detail_path = os.path.join(base_dir, "output", f"{file_prefix}_study_detail_{current_time}.csv")
     detail_all.to_csv(detail_path, index=False)
 
-    study_id         = create_study(study_description)
-    detail_affected  = upsert_study_detail(detail_all, study_id)
-    det_affected     = upsert_strangle_study_det(detail_all, study_id)
-    summary_affected = upsert_study_summary(summaries_mid, summaries_worst, study_id)
+    with transaction() as conn:
+        study_id         = create_study(study_description, conn=conn)
+        detail_affected  = upsert_study_detail(detail_all, study_id, conn=conn)
+        det_affected     = upsert_strangle_study_det(detail_all, study_id, conn=conn)
+        summary_affected = upsert_study_summary(summaries_mid, summaries_worst, study_id, conn=conn)
 
     t2 = time.perf_counter()
     print(f"\n[TIMING] total: {t2-t0:.2f}s")
@@ -213,9 +214,10 @@ def put_spread_study(tickers, ts_start="2020-12-15", ts_end="2026-03-16",
     detail_path = os.path.join(base_dir, "output", f"put_spread_study_detail_{current_time}.csv")
     detail_all.to_csv(detail_path, index=False)
 
-    study_id         = create_study(study_description)
-    detail_affected  = upsert_study_detail(detail_all, study_id)
-    summary_affected = upsert_study_summary(summaries_mid, summaries_worst, study_id)
+    with transaction() as conn:
+        study_id         = create_study(study_description, conn=conn)
+        detail_affected  = upsert_study_detail(detail_all, study_id, conn=conn)
+        summary_affected = upsert_study_summary(summaries_mid, summaries_worst, study_id, conn=conn)
 
     t2 = time.perf_counter()
     print(f"\n[TIMING] total: {t2-t0:.2f}s")
@@ -1,5 +1,5 @@
 import os, asyncio
-from datetime import datetime, date
+from datetime import date
 from lib.commons.list_contracts import list_contracts_for_expiry
 from lib.commons.get_underlying_price import get_underlying_price
 from lib.commons.nearest_strike_contract import expected_move, nearest_strike_contract
@@ -13,35 +13,33 @@ from dateutil.relativedelta import relativedelta
 
 #Ravish likes to find near date that expires in 10-15 days.
 async def get_chains(ticker):
-    unfiltered_exps = await  list_expirations(ticker)
-    today = date.today()
-    
     unfiltered_exps = await list_expirations(ticker)
     today =date.today()
     
-    start_date_near_boundary = today + relativedelta(days=10)
-    start_date_far_boundary = today + relativedelta(days=15)
+    # Expirations are ISO YYYY-MM-DD strings, which order correctly as strings,
+    # so the windows are compared without parsing every date.
+    start_date_near_boundary = (today + relativedelta(days=10)).isoformat()
+    start_date_far_boundary = (today + relativedelta(days=15)).isoformat()
     
     filtered_start_dates = [
         d for d in unfiltered_exps
-        if datetime.strptime(d, "%Y-%m-%d").date() >= start_date_near_boundary and datetime.strptime(d, "%Y-%m-%d").date()<= start_date_far_boundary
+        if start_date_near_boundary <= d <= start_date_far_boundary
     ]
 
     if len(filtered_start_dates)==0:
         return None, None
     start_date_str = filtered_start_dates[0]
-    start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date() 
+    start_date = date.fromisoformat(start_date_str)
     
-    end_date_near_boundary = start_date + relativedelta(days=7)
-    end_date_far_boundary = start_date + relativedelta(days = 14)
+    end_date_near_boundary = (start_date + relativedelta(days=7)).isoformat()
+    end_date_far_boundary = (start_date + relativedelta(days = 14)).isoformat()
 
     filtered_end_dates = [
         d for d in unfiltered_exps
-        if datetime.strptime(d, "%Y-%m-%d").date() >= end_date_near_boundary and datetime.strptime(d, "%Y-%m-%d").date() <= end_date_far_boundary
+        if end_date_near_boundary <= d <= end_date_far_boundary
     ]
     
     end_date_str = filtered_end_dates[0]
-    end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
     near_chain = await list_contracts_for_expiry(ticker, start_date_str)
     far_chain = await list_contracts_for_expiry(ticker, end_date_str)
     
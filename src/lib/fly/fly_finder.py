@@ -1,106 +1,161 @@
-import os, asyncio
-from datetime import datetime, date
-from lib.commons.list_contracts import list_contracts_for_expiry
+import os, sys, asyncio, json
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from pathlib import Path
+import numpy as np
+from lib.commons.list_contracts import list_chain_for_expiry, nearest_strike
 from lib.commons.get_underlying_price import get_underlying_price
 from lib.commons.list_expirations import list_expirations
-from dateutil.relativedelta import relativedelta
+from lib.tradier.tradier_client_wrapper import TradierClient
 
 
 # Run this from the root directory with PYTHONPATH=src python -m lib.fly.fly_finder
 
+TRADIER_API_KEY = os.getenv("TRADIER_API_KEY")
 
-async def find_fly(ticker, spot = None, verbose=False):
-    global_min_roi = None
+# Max tickers in flight at once; TradierClient's connector caps open sockets at 50.
+MAX_CONCURRENT_TICKERS = 10
+# Chain fetches in flight per ticker.
+MAX_CONCURRENT_EXPIRATIONS = 8
+# The only contract keys get_contracts/profitability read.
+FLY_FIELDS = ("option_type", "strike", "bid", "mid", "open_interest", "greeks")
+
+# Tickers that produced no fly are skipped for this many days. Most of big_list
+# (illiquid names, narrow strikes) fails the W/S and C/W gates every day.
+REJECT_TTL_DAYS = 5
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+_REJECT_CACHE = _REPO_ROOT / "data" / "cache" / "fly_rejects.json"
+
+
+def _load_rejects():
+    """Return {ticker: last_rejected_iso_date}, dropping entries older than REJECT_TTL_DAYS."""
+    if not _REJECT_CACHE.exists():
+        return {}
+    cutoff = (date.today() - timedelta(days=REJECT_TTL_DAYS)).isoformat()
+    rejects = json.loads(_REJECT_CACHE.read_text())
+    return {t: d for t, d in rejects.items() if d > cutoff}
+
+
+def _save_rejects(rejects):
+    _REJECT_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    _REJECT_CACHE.write_text(json.dumps(rejects, indent=2, sort_keys=True))
+
+
+async def find_fly(ticker, client, spot = None, verbose=False):
+    """
+    Return the summary lines for ticker's qualifying flies: [] when it was scored and
+    nothing qualified, None when it could not be evaluated (no spot quote).
+    """
     if spot == None:
-        spot = await get_underlying_price(ticker)
+        # Spot and expirations are independent lookups; overlap the two round trips.
+        spot, filtered = await asyncio.gather(
+            get_underlying_price(ticker, client=client),
+            find_valid_expirations(ticker, client),
+        )
         if spot is None:
             if verbose:
                 print(f"Can't find spot for {ticker}")
-            return
-    
-    filtered = await find_valid_expirations(ticker)
-    for expiration_date in filtered:
-         global_min_roi = await get_contracts(ticker, expiration_date, spot, global_min_roi, verbose)
-    # if global_min_roi is not None:
-    #     print(f"{ticker}, {global_min_roi}") 
-
-async def get_contracts(ticker, expiry, spot,  global_min_roi, verbose = False):
-    dte = ((datetime.strptime(expiry, "%Y-%m-%d")).date() - date.today()).days
-    
-    contracts = await list_contracts_for_expiry(ticker, expiry)
-    if contracts is None:
-        return
+            return None
+    else:
+        filtered = await find_valid_expirations(ticker, client)
+
+    # Expirations are scored independently, so fetch their chains concurrently.
+    sem = asyncio.Semaphore(MAX_CONCURRENT_EXPIRATIONS)
+
+    async def one(expiration_date, dte):
+        async with sem:
+            return await get_contracts(ticker, client, expiration_date, dte, spot, verbose)
+
+    results = await asyncio.gather(*(one(e, d) for e, d in filtered))
+    candidates = [(e, d, *legs) for (e, d), legs in zip(filtered, results) if legs]
+    return profitability(ticker, spot, candidates, verbose)
+
+async def get_contracts(ticker, client, expiry, dte, spot, verbose = False):
+    sides = await list_chain_for_expiry(ticker, expiry, fields=FLY_FIELDS, client=client)
     if verbose:
         print(f"underlying spot={round(spot,2)}")
     tie_breaker = "higher"
-    
-    
-    put_contracts = [c for c in contracts if c.get("option_type").lower() == "put"]
-    call_contracts = [c for c in contracts if c.get("option_type").lower() == "call"]
-    
-   
-    tie_breaker = "higher"
     prefer_high = (tie_breaker != "lower")
-    
-    atm_put_contract = min(
-        put_contracts,
-        key = lambda c: (
-            abs(c["strike"]- spot),
-            0 if (c["strike"] >= spot) == prefer_high else 1,
-            c["strike"] if prefer_high else -c["strike"]
-        )
-    )
 
-    #print(atm_put_contract)
+    # The chain arrives split by side; every lookup below is a bisect on the
+    # strike arrays, landing on the first contract listed at a strike.
+    calls, puts = sides.calls, sides.puts
+    call_strikes, put_strikes = sides.call_strikes, sides.put_strikes
 
-    if atm_put_contract["bid"] is None:
+    atm_strike = nearest_strike(put_strikes, spot, prefer_high)
+    if atm_strike is None:
         return
-    
+    atm_put_contract = puts[bisect_left(put_strikes, atm_strike)]
+
+    #print(atm_put_contract)
+
     if atm_put_contract["open_interest"] < 500:
         return
-    atm_strike = atm_put_contract["strike"]
-    
-    atm_call_contract = next(
-    c for c in call_contracts if c["strike"] == atm_strike
-    )
 
+    i = bisect_left(call_strikes, atm_strike)
+    atm_call_contract = calls[i] if i < len(calls) and call_strikes[i] == atm_strike else None
 
-    call_above_atm = min(
-        (c for c in call_contracts if c["strike"] > atm_strike),
-        key=lambda c: c["strike"],
-        default=None
-    )
+    # Wings are the adjacent listed strikes.
+    i = bisect_right(call_strikes, atm_strike)
+    call_above_atm = calls[i] if i < len(calls) else None
+
+    i = bisect_left(put_strikes, atm_strike)
+    put_below_atm = puts[bisect_left(put_strikes, put_strikes[i - 1])] if i > 0 else None
 
-    if call_above_atm["bid"] is None:
+    legs = (atm_put_contract, atm_call_contract, put_below_atm, call_above_atm)
+    if not all(c and c["bid"] is not None and c["greeks"] for c in legs):
         return
+    return legs
+
+def _fly_score(spot, k_lp, k_atm, k_lc, sp_mid, sc_mid, lp_mid, lc_mid):
+    """
+    Iron fly kernel over parallel arrays, one element per expiration. Returns
+    (initial_credit, credit_per_wing_width, width_over_spot_pct, max_loss) arrays;
+    no dict access, rounding or formatting.
+    """
+    #initial credit is also the max profit.
+    initial_credit = sp_mid + sc_mid - lp_mid - lc_mid
+    wing_width = k_lc - k_atm
+    credit_per_wing_width = initial_credit / wing_width
+    width_over_spot = 100 * wing_width / spot
+    max_loss = np.minimum(k_lc - k_atm - initial_credit, k_atm - k_lp - initial_credit)
+    return initial_credit, credit_per_wing_width, width_over_spot, max_loss
+
+def profitability(ticker, spot, candidates, verbose = False):
+    """
+    Score every (expiry, dte, sp, sc, lp, lc) candidate for a ticker in one vectorized
+    pass and return a summary line for each fly that clears the W/S and C/W gates.
+    """
+    if not candidates:
+        return []
+
+    # (n, 4 legs, strike/mid), legs ordered sp, sc, lp, lc. Mids come precomputed
+    # from list_contracts_for_expiry; a one-sided quote's None mid becomes NaN.
+    quotes = np.array(
+        [[(leg["strike"], leg["mid"]) for leg in cand[2:]] for cand in candidates],
+        dtype=np.float64,
+    )
+    strikes = quotes[:, :, 0]
+    mids = quotes[:, :, 1]
 
-    
-    put_below_atm = max(
-        (c for c in put_contracts if c["strike"] < atm_strike),
-        key=lambda c: c["strike"],
-        default=None
+    initial_credit, credit_per_wing_width, width_over_spot, max_loss = _fly_score(
+        spot, strikes[:, 2], strikes[:, 0], strikes[:, 3],
+        mids[:, 0], mids[:, 1], mids[:, 2], mids[:, 3],
     )
 
-    if put_below_atm is None or put_below_atm["bid"] is None or call_above_atm is None or call_above_atm["bid"] is None:
-        return
+    # Filter on the raw floats; rounding and formatting only happen for survivors.
+    keep = np.flatnonzero((width_over_spot >= 3) & (credit_per_wing_width >= 0.8))
 
-    if atm_put_contract["greeks"] is None or atm_call_contract["greeks"] is None or call_above_atm["greeks"] is None or put_below_atm["greeks"] is None:
-        return
-    profitability(ticker, spot, expiry, atm_put_contract, atm_call_contract, put_below_atm, call_above_atm,
-    dte, global_min_roi,  verbose)
+    lines = []
+    for i in keep.tolist():
+        expiry, dte, sp, sc, lp, lc = candidates[i]
+        lines.append(_fly_line(ticker, expiry, sp, sc, lp, lc, float(initial_credit[i]),
+            float(credit_per_wing_width[i]), float(width_over_spot[i]), float(max_loss[i])))
+    return lines
 
-def profitability(ticker,spot,expiry,sp, sc, lp, lc, dte, global_min_roi, verbose = False):
-    
+def _fly_line(ticker, expiry, sp, sc, lp, lc, initial_credit, credit_per_wing_width, width_over_spot, max_loss):
     atm_strike = sp["strike"]
-    
-    atm_put_mid = (float(sp["bid"]) + float(sp["ask"]))/2.0
-    atm_call_mid = (float(sc["bid"]) + float(sc["ask"]))/2.0
-    long_put_mid = (float(lp["bid"]) + float(lp["ask"]))/2.0
-    long_call_mid = (float(lc["bid"]) + float(lc["ask"]))/2.0
-    
-    #initial credit is also the max profit.
-    initial_credit = atm_put_mid + atm_call_mid - long_put_mid - long_call_mid
-    
+
     g_sc = sc.get("greeks").get("gamma")
     g_sp = sp.get("greeks").get("gamma")
     g_lc = lc.get("greeks").get("gamma")
@@ -111,22 +166,10 @@ def profitability(ticker,spot,expiry,sp, sc, lp, lc, dte, global_min_roi, verbos
 
     gamma_ratio = round(100*abs(net_gamma)/ (g_sc + g_sp),1)
 
-    bull_wing_max_loss = lc["strike"] - atm_strike - initial_credit
-    bear_wing_max_loss = atm_strike - lp["strike"] -initial_credit
-
-    max_loss = min(bull_wing_max_loss, bear_wing_max_loss)
-
     lower_breakeven = atm_strike - initial_credit
     upper_breakeven = atm_strike + initial_credit
 
-    credit_per_wing_width = initial_credit / (lc["strike"] - atm_strike)
-
-    width_over_spot = round(100 * (lc["strike"] - atm_strike)/spot,1)
-
-    if width_over_spot < 3 or credit_per_wing_width < 0.8:
-        return
-
-    print(f"{ticker}, {expiry} strikes = {lp["strike"]},{atm_strike},{lc["strike"]}, max profit = {round(100*initial_credit,2)}, max loss = {round(100*max_loss,2)}, BE = {lower_breakeven}, {upper_breakeven}, C/W={round(credit_per_wing_width,2)}, W/S={width_over_spot}%, {gamma_ratio}%")
+    return (f"{ticker}, {expiry} strikes = {lp["strike"]},{atm_strike},{lc["strike"]}, max profit = {round(100*initial_credit,2)}, max loss = {round(100*max_loss,2)}, BE = {lower_breakeven}, {upper_breakeven}, C/W={round(credit_per_wing_width,2)}, W/S={round(width_over_spot,1)}%, {gamma_ratio}%")
 
 
     # strikes
@@ -168,22 +211,52 @@ def profitability(ticker,spot,expiry,sp, sc, lp, lc, dte, global_min_roi, verbos
     # return global_min_roi
 
 
-async def find_valid_expirations(ticker):
-    unfiltered_exps = await list_expirations(ticker)
-    today =date.today()
-    oldest_strike = today + relativedelta(days=12)
+async def find_valid_expirations(ticker, client):
+    unfiltered_exps = await list_expirations(ticker, client=client)
+    # Tradier returns ISO YYYY-MM-DD dates, which order correctly as strings.
+    # Each survivor is parsed once here and carried with its DTE.
+    today = date.today()
+    cutoff = (today + timedelta(days=12)).isoformat()
     filtered = [
-        d for d in unfiltered_exps
-        if datetime.strptime(d, "%Y-%m-%d").date() <= oldest_strike
+        (d, (date.fromisoformat(d) - today).days)
+        for d in unfiltered_exps if d <= cutoff
     ]
     return filtered
 
 big_list = ["A","AA","AAM","AAM.U","AAM.W","AAMI","AAP","AAT","AAUC","AB","ABBV","ABCB","ABEV","ABG","ABM","ABR","ABR$D","ABR$E","ABR$F","ABT","ABX","ABXL","ACA","ACCO","ACEL","ACH","ACHR","ACHR.W","ACI","ACLO","ACM","ACN","ACP","ACP$A","ACR","ACR$C","ACR$D","ACRE","ACV","ACVA","AD","ADC","ADC$A","ADCT","ADM","ADNT","ADT","ADX","AEE","AEFC","AEG","AEM","AEO","AER","AERO","AES","AESI","AEXA","AFB","AFG","AFGB","AFGC","AFGD","AFGE","AFL","AG","AGCO","AGD","AGI","AGL","AGM","AGM$D","AGM$E","AGM$F","AGM$G","AGM$H","AGM.A","AGO","AGRO","AGX","AHH","AHH$A","AHL","AHL$D","AHL$E","AHL$F","AHR","AHT","AHT$D","AHT$F","AHT$G","AHT$H","AHT$I","AI","AIG","AII","AIIA","AIIA.R","AIIA.U","AIN","AIO","AIR","AIT","AIV","AIZ","AIZN","AJG","AKA","AKAF","AKO.A","AKO.B","AKR","AL","ALB","ALB$A","ALC","ALEX","ALG","ALH","ALIT","ALK","ALL","ALL$B","ALL$H","ALL$I","ALL$J","ALLE","ALLY","ALSN","ALTG","ALTG$A","ALUB.U","ALUR","ALUR.W","ALV","ALX","AM","AMBP","AMBQ","AMC","AMCR","AME","AMG","AMH","AMH$G","AMH$H","AMN","AMP","AMPX","AMPX.W","AMPY","AMR","AMRC","AMRZ","AMT","AMTB","AMTD","AMTM","AMWL","AMX","AN","ANDG","ANET","ANF","ANG$D","ANGX","ANRO","ANVS","AOD","AOMD","AOMN","AOMR","AON","AORT","AOS","AP","APAM","APD","APG","APH","APLE","APO","APO$A","APOS","APTV","AQN","AQNB","AR","ARCO","ARDC","ARDT","ARE","ARES","ARES$B","ARI","ARL","ARLO","ARMK","AROC","ARR","ARR$C","ARW","ARX","AS","ASA","ASAN","ASB","ASB$E","ASB$F","ASBA","ASC","ASG","ASGI","ASGN","ASH","ASIC","ASIX","ASPN","ASR","ASX","ATEN","ATGE","ATH$A","ATH$B","ATH$D","ATH$E","ATHM","ATHS","ATI","ATKR","ATMU","ATO","ATR","ATS","AU","AUB","AUB$A","AUNA","AVA","AVAL","AVB","AVBC","AVD","AVK","AVNS","AVNT","AVTR","AVY","AWF","AWI","AWK","AWP","AWR","AX","AXIA","AXIA$","AXIA$C","AXL","AXP","AXR","AXS","AXS$E","AXTA","AYI","AZO","AZZ","B","BA","BA$A","BABA","BAC","BAC$B","BAC$E","BAC$K","BAC$L","BAC$M","BAC$N","BAC$O","BAC$P","BAC$Q","BAC$S","BAH","BAK","BALL","BALY","BAM","BANC","BANC$F","BAP","BARK","BAX","BB","BBAI","BBAI.W","BBAR","BBBY","BBBY.W","BBD","BBDC","BBDO","BBN","BBT","BBU","BBUC","BBVA","BBW","BBWI","BBY","BC","BC$C","BCAT","BCC","BCE","BCGD","BCH","BCO","BCS","BCSF","BCSM","BCSS","BCSS.U","BCSS.W","BCX","BDC","BDJ","BDN","BDX","BE","BEBE.U","BEKE","BEN","BEP","BEP$A","BEPC","BEPH","BEPI","BEPJ","BETA","BF.A","BF.B","BFAM","BFH","BFH$A","BFK","BFLY","BFLY.W","BFS","BFS$D","BFS$E","BFZ","BG","BGB","BGH","BGR","BGS","BGSF","BGSI","BGT","BGX","BGY","BH","BH.A","BHC","BHE","BHK","BHP","BHR","BHR$B","BHR$D","BHV","BHVN","BILL","BIO","BIO.B","BIP","BIP$A","BIP$B","BIPC","BIPH","BIPI","BIPJ","BIRK","BIT","BJ","BK","BK$K","BKD","BKE","BKH","BKKT","BKKT.W","BKN","BKSY","BKSY.W","BKT","BKU","BKV","BLCO","BLD","BLDR","BLE","BLK","BLND","BLSH","BLW","BLX","BMA","BME","BMEZ","BMI","BML$G","BML$H","BML$J","BML$L","BMN","BMO","BMY","BN","BNED","BNH","BNJ","BNL","BNS","BNT","BNY","BOC","BOE","BOH","BOH$A","BOH$B","BOND","BOOT","BORR","BOW","BOX","BP","BPRE","BR","BRBR","BRC","BRCC","BRCE","BRIE","BRK.A","BRK.B","BRO","BROS","BRSL","BRSP","BRT","BRW","BRX","BSAC","BSBR","BSL","BSM","BST","BSTZ","BSX","BTA","BTE","BTI","BTO","BTT","BTU","BTX","BTZ","BUD","BUI","BUR","BURL","BUXX","BV","BVN","BW","BW$A","BWA","BWG","BWLP","BWMX","BWNB","BWXT","BX","BXC","BXMT","BXMX","BXP","BXSL","BY","BYD","BYM","BZH","C","C$N","CAAP","CABO","CACI","CADE","CADE$A","CAE","CAF","CAG","CAH","CAL","CALX","CANG","CAPL","CARR","CARS","CAT","CATO","CAVA","CB","CBAN","CBL","CBNA","CBRE","CBT","CBU","CBZ","CC","CCI","CCID","CCIF","CCJ","CCK","CCL","CCM","CCO","CCS","CCU","CCZ","CDE","CDLR","CDP","CDR$B","CDR$C","CDRE","CE","CEE","CELG.R","CEPU","CF","CFG","CFG$E","CFG$H","CFG$I","CFND","CFR","CFR$B","CGAU","CGV","CHCT","CHD","CHE","CHGG","CHH","CHMI","CHMI$A","CHMI$B","CHPT","CHT","CHWY","CI","CIA","CIB","CICB","CIEN","CIF","CIG","CIG.C","CII","CIM","CIM$A","CIM$B","CIM$C","CIM$D","CIMN","CIMO","CIMP","CINT","CIO","CIO$A","CION","CIVI","CL","CLB","CLCO","CLDT","CLDT$A","CLF","CLH","CLPR","CLS","CLVT","CLW","CLX","CM","CMA","CMA$B","CMBT","CMC","CMCM","CMDB","CMG","CMI","CMP","CMPO","CMRE","CMRE$B","CMRE$C","CMRE$D","CMS","CMS$B","CMS$C","CMSA","CMSC","CMSD","CMTG","CMU","CNA","CNC","CNF","CNH","CNI","CNK","CNM","CNMD","CNNE","CNO","CNO$A","CNP","CNQ","CNR","CNS","CNX","CODI","CODI$A","CODI$B","CODI$C","COF","COF$I","COF$J","COF$K","COF$L","COF$N","COHR","COLD","COMP","CON","COOK","COP","COPL","COPL.U","COPL.W","COR","COSO","COTY","COUR","CP","CPA","CPAC","CPAI","CPAY","CPF","CPK","CPNG","CPRI","CPS","CPT","CQP","CR","CRBD","CRBG","CRC","CRCL","CRD.A","CRD.B","CRGY","CRH","CRI","CRK","CRL","CRM","CRS","CRT","CSAN","CSL","CSR","CSTM","CSV","CSW","CTA$A","CTA$B","CTBB","CTDD","CTEV","CTO","CTO$A","CTOS","CTRA","CTRE","CTRI","CTS","CTVA","CUBB","CUBE","CUBI","CUK","CULP","CURB","CURV","CUZ","CVE","CVE.W","CVEO","CVI","CVLG","CVNA","CVS","CVX","CW","CWAN","CWEN","CWEN.A","CWH","CWK","CWT","CX","CXE","CXH","CXM","CXT","CXW","CYD","CYH","D","DAC","DAL","DAN","DAO","DAR","DAVA","DAY","DB","DBD","DBI","DBL","DBRG","DBRG$H","DBRG$I","DBRG$J","DCI","DCO","DD","DDD","DDL","DDS","DDT","DE","DEA","DEC","DECK","DEI","DELL","DEO","DFH","DFIN","DFP","DG","DGX","DHF","DHI","DHR","DHT","DHX","DIAX","DIN","DINO","DIS","DIVY","DK","DKL","DKS","DLB","DLNG","DLNG$A","DLR","DLR$J","DLR$K","DLR$L","DLX","DLY","DMA","DMB","DMO","DNA","DNOW","DNP","DOC","DOCN","DOCS","DOLE","DOUG","DOV","DOW","DPG","DQ","DRD","DRI","DRLL","DSL","DSM","DSMC","DSTX","DSU","DSX","DSX$B","DSX.W","DT","DTB","DTE","DTF","DTG","DTK","DTM","DTW","DUK","DUK$A","DUKB","DV","DVA","DVN","DX","DX$C","DXC","DXYZ","DY","E","EAF","EAI","EARN","EAT","EB","EBF","EBS","EC","ECAT","ECC","ECC$D","ECCC","ECCF","ECCU","ECCV","ECCW","ECCX","ECG","ECL","ECO","ECVT","ED","EDD","EDF","EDN","EDU","EE","EEA","EEX","EFC","EFC$A","EFC$B","EFC$C","EFC$D","EFR","EFT","EFX","EFXT","EG","EGO","EGP","EGY","EHAB","EHC","EHI","EIC","EICA","EICC","EIG","EIIA","EIX","EL","ELAN","ELC","ELF","ELME","ELPC","ELS","ELV","EMA","EMBJ","EMD","EME","EMF","EMN","EMO","EMP","EMR","ENB","ENIC","ENJ","ENO","ENOV","ENR","ENS","ENVA","EOD","EOG","EOI","EOS","EOT","EP$C","EPAC","EPAM","EPC","EPD","EPR","EPR$C","EPR$E","EPR$G","EPRT","EQBK","EQH","EQH$A","EQH$C","EQNR","EQR","EQS","EQT","ERO","ES","ESAB","ESE","ESI","ESNT","ESRT","ESS","ESTC","ET","ET$I","ETB","ETD","ETG","ETI$","ETJ","ETN","ETO","ETR","ETSY","ETV","ETW","ETX","ETY","EVAC","EVAC.U","EVAC.W","EVC","EVEX","EVEX.W","EVF","EVG","EVH","EVMN","EVN","EVR","EVT","EVTC","EVTL","EVTR","EW","EXG","EXK","EXP","EXPD","EXR","F","F$B","F$C","F$D","FAF","FBIN","FBK","FBP","FBRT","FBRT$E","FC","FCF","FCN","FCPT","FCRS","FCRS.U","FCRS.W","FCRX","FCT","FCX","FDP","FDS","FDX","FE","FEDU","FEGE","FENG","FEOE","FERG","FET","FF","FFA","FFC","FFWM","FG","FGN","FGSN","FHI","FHN","FHN$C","FHN$E","FHN$F","FICO","FIG","FIGS","FIHL","FINS","FINV","FIS","FIX","FIXT","FLC","FLG","FLG$A","FLG$U","FLNG","FLO","FLOC","FLR","FLS","FLUT","FLXR","FMC","FMN","FMS","FMX","FMY","FN","FNB","FND","FNF","FNV","FOA","FOF","FOR","FOUR","FOUR$A","FPF","FPH","FPI","FR","FRA","FRGE","FRO","FRT","FRT$C","FSCO","FSK","FSM","FSS","FSSL","FT","FTHY","FTI","FTK","FTS","FTV","FTW","FTW.U","FTW.W","FTWO","FUBO","FUL","FUN","FVR","FVRR","FXED","G","GAB","GAB$G","GAB$H","GAB$K","GAM","GAM$B","GAP","GATX","GBAB","GBCI","GBTG","GBX","GCO","GCTS","GCTS.W","GCV","GD","GDDY","GDIV","GDL","GDO","GDOT","GDV","GDV$H","GDV$K","GE","GEF","GEF.B","GEL","GENI","GEO","GES","GETY","GEV","GF","GFF","GFI","GFL","GFR","GGB","GGG","GGT","GGT$E","GGT$G","GGZ","GHC","GHG","GHI","GHM","GHY","GIB","GIC","GIL","GIS","GJH","GJO","GJP","GJR","GJS","GJT","GKOS","GL","GL$D","GLOB","GLOP$A","GLOP$B","GLOP$C","GLP","GLP$B","GLW","GM","GME","GME.W","GMED","GMRE","GMRE$A","GMRE$B","GNE","GNK","GNL","GNL$A","GNL$B","GNL$D","GNL$E","GNRC","GNT","GNT$A","GNW","GOF","GOLD","GOLF","GOOS","GOTU","GPC","GPI","GPJA","GPK","GPMT","GPMT$A","GPN","GPOR","GPRK","GRBK","GRBK$A","GRC","GRDN","GRMN","GRND","GRNT","GROV","GRX","GS","GS$A","GS$C","GS$D","GSBD","GSK","GSL","GSL$B","GTES","GTLS","GTN","GTN.A","GTY","GUG","GUT","GUT$C","GVA","GWH","GWH.W","GWRE","GWW","GXO","GYLD","H","HAE","HAFN","HAL","HASI","HAYW","HBB","HBM","HCA","HCC","HCI","HCXY","HD","HDB","HE","HEI","HEI.A","HEQ","HESM","HF","HFEQ","HFGM","HFMF","HFND","HFRO","HFRO$A","HFRO$B","HG","HGER","HGLB","HGTY","HGV","HHH","HI","HIG","HIG$G","HII","HIMS","HIO","HIPO","HIW","HIX","HKD","HL","HL$B","HLF","HLI","HLIO","HLLY","HLLY.W","HLN","HLT","HLX","HMC","HMN","HMY","HNGE","HNI","HOG","HOMB","HOUS","HOV","HP","HPE","HPE$C","HPF","HPI","HPP","HPP$C","HPQ","HPS","HQH","HQL","HR","HRB","HRI","HRL","HRTG","HSBC","HSHP","HSY","HTB","HTD","HTFB","HTFC","HTGC","HTH","HTT","HUBB","HUBS","HUM","HUN","HUYA","HVT","HVT.A","HWM","HXL","HY","HYAC","HYAC.U","HYAC.W","HYBX","HYI","HYT","HYT.V","HYTR","HZO","IAE","IAG","IBM","IBN","IBP","IBTA","ICE","ICL","ICR$A","IDA","IDE","IDT","IEX","IFF","IFN","IFS","IGA","IGCB","IGD","IGI","IGR","IH","IHD","IHG","IHS","IIF","IIIN","IIM","IIPR","IIPR$A","IMAX","INFO","INFY","ING","INGM","INGR","INN","INN$E","INN$F","INR","INSP","INSW","INVH","INVX","IONQ","IONQ.W","IOT","IP","IPB","IPI","IQI","IQV","IR","IRM","IRS","IRS.W","IRT","ISD","IT","ITGR","ITT","ITUB","ITW","IVR","IVR$C","IVT","IVZ","IX","J","JACS","JACS.R","JACS.U","JBGS","JBI","JBK","JBL","JBND","JBS","JBTM","JCE","JCI","JEF","JELD","JENA","JENA.R","JENA.U","JFR","JGH","JHG","JHI","JHS","JHX","JILL","JKS","JLL","JLS","JMIA","JMM","JNJ","JOBY","JOBY.W","JOE","JOF","JPC","JPM","JPM$C","JPM$D","JPM$J","JPM$K","JPM$L","JPM$M","JQC","JRI","JRS","JXN","JXN$A","KAI","KB","KBDC","KBH","KBR","KD","KEN","KEP","KEX","KEY","KEY$I","KEY$J","KEY$K","KEY$L","KEYS","KF","KFRC","KFS","KFY","KGC","KGS","KIM","KIM$L","KIM$M","KIM$N","KIO","KKR","KKR$D","KKRS","KKRT","KLAR","KLC","KMI","KMPB","KMPR","KMT","KMX","KN","KNF","KNOP","KNSL","KNTK","KNX","KO","KODK","KOF","KOP","KORE","KOS","KR","KRC","KREF","KREF$A","KRG","KRMN","KRO","KRP","KRSP","KRSP.U","KRSP.W","KSS","KT","KTB","KTF","KTH","KTN","KVUE","KVYO","KW","KWR","KYN","L","LAC","LAD","LADR","LANV","LANV.W","LAR","LAW","LAZ","LB","LBRT","LC","LCII","LDI","LDOS","LDP","LEA","LEG","LEN","LEN.B","LEO","LEU","LEVI","LFT","LFT$A","LGI","LH","LHX","LII","LION","LITB","LLY","LMND","LMT","LNC","LNC$D","LND","LNG","LNN","LOAR","LOB","LOB$A","LOCL","LOMA","LOW","LPG","LPL","LPX","LRN","LSPD","LTC","LTH","LTM","LU","LUCK","LUMN","LUV","LUXE","LVS","LVWR","LVWR.W","LW","LXFR","LXP","LXP$C","LXU","LYB","LYG","LYV","LZB","LZM","LZM.W","M","MA","MAA","MAA$I","MAC","MAGN","MAIN","MAN","MANU","MAS","MATV","MATX","MAX","MBC","MBI","MC","MCB","MCD","MCI","MCK","MCN","MCO","MCR","MCS","MCY","MD","MDST","MDT","MDU","MDV","MDV$A","MEC","MED","MEG","MEGI","MEI","MER$K","MET","MET$A","MET$E","MET$F","MFA","MFA$B","MFA$C","MFAN","MFAO","MFC","MFG","MFM","MFSB","MFSG","MFSI","MFSM","MFSV","MG","MGA","MGF","MGM","MGR","MGRB","MGRD","MGRE","MGY","MH","MHD","MHF","MHK","MHLA","MHN","MHNC","MHO","MIAX","MICC","MIN","MIR","MITN","MITP","MITT","MITT$A","MITT$B","MITT$C","MIY","MKC","MKC.V","MKL","MLI","MLM","MLP","MLR","MMC","MMD","MMI","MMID","MMKT","MMM","MMS","MMT","MMU","MNR","MNSO","MNTN","MO","MOD","MODG","MOG.A","MOG.B","MOGU","MOH","MOS","MOV","MP","MPA","MPC","MPLX","MPV","MPW","MPX","MQT","MQY","MRK","MRP","MS","MS$A","MS$E","MS$F","MS$I","MS$K","MS$L","MS$O","MS$P","MS$Q","MSA","MSB","MSC","MSCI","MSD","MSDL","MSGE","MSGS","MSI","MSIF","MSM","MT","MTB","MTB$H","MTB$J","MTB$K","MTD","MTDR","MTG","MTH","MTN","MTR","MTRN","MTUS","MTW","MTX","MTZ","MUA","MUC","MUE","MUFG","MUJ","MUR","MUSA","MUSE","MUX","MVF","MVO","MVT","MWA","MX","MXE","MXF","MYD","MYE","MYI","MYN","NABL","NAC","NAD","NAN","NAT","NATL","NAZ","NBB","NBHC","NBR","NBXG","NC","NCA","NCDL","NCLH","NCV","NCV$A","NCZ","NCZ$A","NDMO","NE","NE.A","NE.W","NEA","NEE","NEE$N","NEE$S","NEE$T","NEE$U","NEM","NET","NEU","NEXA","NFG","NFJ","NGG","NGL","NGL$B","NGL$C","NGS","NGVC","NGVT","NHI","NI","NIC","NIE","NIM","NINE","NIO","NIQ","NJR","NKE","NKX","NL","NLOP","NLY","NLY$F","NLY$G","NLY$I","NLY$J","NMAI","NMAX","NMCO","NMG","NMI","NMM","NMR","NMS","NMT","NMZ","NNI","NNN","NNY","NOA","NOAH","NOC","NOG","NOK","NOM","NOMD","NOTE","NOTE.W","NOV","NOW","NP","NPB","NPCT","NPFD","NPK","NPKI","NPO","NPV","NPWR","NPWR.W","NQP","NRDY","NREF","NREF$A","NRG","NRGV","NRK","NRP","NRT","NRUC","NSA","NSA$A","NSA$B","NSC","NSP","NTB","NTR","NTST","NTZ","NU","NUE","NUS","NUV","NUVB","NUVB.W","NUW","NVG","NVGS","NVO","NVR","NVRI","NVS","NVST","NVT","NWAX.U","NWG","NWN","NX","NXC","NXDR","NXDT","NXDT$A","NXE","NXG","NXJ","NXN","NXP","NXRT","NYC","NYT","NZF","O","OAK$A","OAK$B","OBDC","OBK","OC","ODC","ODV","OEC","OFG","OGE","OGN","OGS","OHI","OI","OIA","OII","OIS","OKE","OKLO","OLN","OLP","OMC","OMF","ONIT","ONL","ONON","ONTF","ONTO","OOMA","OPAD","OPFI","OPFI.W","OPLN","OPP","OPP$A","OPP$B","OPTU","OPY","OR","ORA","ORC","ORCL","ORI","ORN","OSCR","OSG","OSK","OTF","OTIS","OUT","OVV","OWL","OWLT","OXM","OXY","OXY.W","PAAS","PAC","PACK","PACS","PAG","PAGS","PAI","PAII","PAII.U","PAII.W","PAM","PAR","PARR","PATH","PAXS","PAY","PAYC","PB","PBA","PBF","PBH","PBI","PBI$B","PBR","PBR.A","PBT","PCF","PCG","PCG$X","PCM","PCN","PCOR","PCQ","PD","PDCC","PDI","PDM","PDO","PDPA","PDS","PDT","PDX","PEB","PEB$E","PEB$F","PEB$G","PEB$H","PEG","PEN","PEO","PERF","PERF.W","PEW","PEW.W","PFD","PFE","PFGC","PFH","PFL","PFLT","PFN","PFO","PFS","PFSI","PG","PGP","PGR","PGZ","PH","PHG","PHI","PHIN","PHK","PHM","PHR","PII","PIM","PINE","PINE$A","PINS","PIPR","PJT","PK","PKE","PKG","PKST","PKX","PL","PL.W","PLD","PLNT","PLOW","PLYM","PM","PML","PMM","PMO","PMT","PMT$A","PMT$B","PMT$C","PMTU","PMTV","PMTW","PNC","PNFP","PNFP$A","PNFP$B","PNFP$C","PNI","PNNT","PNR","PNW","POR","POST","PPG","PPL","PPT","PR","PRA","PRCS","PRG","PRGO","PRH","PRI","PRIF$D","PRIF$J","PRIF$K","PRIF$L","PRIM","PRKS","PRLB","PRM","PRMB","PRS","PRSU","PRT","PRU","PRVS","PSA","PSA$F","PSA$G","PSA$H","PSA$I","PSA$J","PSA$K","PSA$L","PSA$M","PSA$N","PSA$O","PSA$P","PSA$Q","PSA$R","PSA$S","PSBD","PSEC$A","PSF","PSFE","PSN","PSO","PSQH","PSQH.W","PSTG","PSTL","PSX","PTA","PTY","PUK","PUMP","PVH","PVL","PWR","PX","PXED","PYT","Q","QBTS","QGEN","QSR","QTWO","QUAD","QVCC","QVCD","QXO","QXO$B","R","RA","RAC","RAC.U","RAC.W","RACE","RAL","RAMP","RBA","RBC","RBLX","RBOT","RBRK","RC","RC$C","RC$E","RCB","RCC","RCD","RCI","RCL","RCS","RCUS","RDDT","RDN","RDW","RDY","RELX","RERE","RES","REVG","REX","REXR","REXR$B","REXR$C","REZI","RF","RF$C","RF$E","RF$F","RFI","RFL","RFM","RFMZ","RGA","RGR","RGT","RH","RHI","RHLD","RHP","RIG","RIO","RITM","RITM$A","RITM$B","RITM$C","RITM$D","RITM$E","RIV","RIV$A","RJF","RKT","RL","RLI","RLJ","RLJ$A","RLTY","RLX","RM","RMAX","RMD","RMI","RMM","RMMZ","RMT","RNG","RNGR","RNP","RNR","RNR$F","RNR$G","RNST","ROG","ROK","ROL","RONB","RPM","RPT","RPT$C","RQI","RRC","RRX","RS","RSF","RSG","RSI","RSKD","RTO","RTX","RVLV","RVT","RVTY","RWT","RWT$A","RWTN","RWTO","RWTP","RWTQ","RXO","RY","RYAM","RYAN","RYI","RYN","RZB","RZC","S","SA","SABA","SAC.U","SAFE","SAH","SAJ","SAM","SAN","SAP","SAR","SARO","SAT","SAY","SAZ","SB","SB$C","SB$D","SBDS","SBH","SBI","SBR","SBS","SBSI","SBSW","SBXD","SBXD.U","SBXD.W","SBXE.U","SCCO","SCD","SCE$G","SCE$K","SCE$L","SCE$M","SCE$N","SCHW","SCHW$D","SCHW$J","SCI","SCL","SCM","SD","SDHC","SDHY","SDRL","SE","SEAL$A","SEAL$B","SEE","SEG","SEI","SEM","SEMR","SES","SES.W","SF","SF$B","SF$C","SF$D","SFB","SFBS","SFL","SG","SGHC","SGI","SGU","SHAK","SHCO","SHEL","SHG","SHO","SHO$H","SHO$I","SHOC","SHW","SI","SID","SIG","SII","SILA","SITC","SITE","SJM","SJT","SKE","SKIL","SKLZ","SKM","SKT","SKY","SKYH","SKYH.W","SLAI","SLB","SLF","SLG","SLG$I","SLGN","SLNZ","SLQT","SLVM","SM","SMA","SMBK","SMC","SMFG","SMG","SMHI","SMP","SMR","SMRT","SMWB","SN","SNA","SNAP","SNDA","SNDR","SNN","SNOW","SNX","SO","SOBO","SOC","SOJC","SOJD","SOJE","SOJF","SOLV","SOMN","SON","SONY","SOR","SOS","SOUL","SOUL.R","SOUL.U","SPB","SPCE","SPE","SPE$C","SPG","SPG$J","SPGI","SPH","SPHR","SPIR","SPMA","SPMC","SPME","SPNT","SPNT$B","SPOT","SPRU","SPXC","SPXX","SQM","SQNS","SR","SR$A","SRE","SREA","SRFM","SRG","SRG$A","SRI","SRL","SRV","SSB","SSD","SSL","SST","SSTK","ST","STAG","STC","STE","STEL","STEM","STEW","STG","STK","STLA","STM","STN","STNG","STRV","STT","STT$G","STUB","STVN","STWD","STXD","STXE","STXG","STXI","STXK","STXM","STXT","STXV","STZ","SU","SUI","SUN","SUNC","SUPV","SUZ","SVV","SW","SWK","SWX","SWZ","SXC","SXI","SXT","SYF","SYF$A","SYF$B","SYK","SYY","T","T$A","T$C","TAC","TAK","TAL","TALO","TAP","TAP.A","TBB","TBBB","TBI","TBLU","TBN","TCAI","TCBX","TCI","TCPA","TD","TDAY","TDC","TDF","TDG","TDOC","TDS","TDS$U","TDS$V","TDW","TDY","TE","TE.W","TECK","TEF","TEI","TEL","TEN","TEN$E","TEN$F","TEO","TEVA","TEX","TFC","TFC$I","TFC$O","TFC$R","TFII","TFIN","TFIN$","TFPM","TFSA","TFX","TG","TGE","TGLS","TGNA","TGS","TGT","THC","THG","THIR","THLV","THO","THQ","THR","THS","THW","TIC","TIMB","TISI","TJX","TK","TKC","TKO","TKR","TLK","TLYS","TM","TME","TMHC","TMO","TNC","TNET","TNGY","TNK","TNL","TOL","TOST","TPB","TPC","TPH","TPL","TPR","TPTA","TPVG","TPYP","TPZ","TR","TRAK","TRC","TREX","TRGP","TRN","TRNO","TROX","TRP","TRTN$A","TRTN$B","TRTN$C","TRTN$D","TRTN$E","TRTN$F","TRTX","TRTX$C","TRU","TRV","TS","TSE","TSI","TSLX","TSM","TSN","TSQ","TT","TTAM","TTC","TTE","TTI","TU","TUYA","TV","TVC","TVE","TWI","TWLO","TWN","TWO","TWO$A","TWO$B","TWO$C","TWOD","TX","TXNM","TXO","TXT","TY","TY$","TYG","TYL","U","UA","UAA","UAN","UBER","UBS","UCB","UDR","UE","UFI","UGI","UGP","UHAL","UHAL.B","UHS","UHT","UI","UIS","UL","ULS","UMC","UMH","UMH$D","UNF","UNFI","UNH","UNM","UNMA","UNP","UP","UPS","URI","USA","USAC","USB","USB$A","USB$H","USB$P","USB$Q","USB$R","USB$S","USFD","USNA","USPH","UTF","UTI","UTL","UTZ","UVE","UVV","UWMC","UZD","UZE","UZF","V","VAC","VACI","VACI.U","VACI.W","VAL","VAL.W","VALE","VATE","VBF","VCV","VEEV","VEL","VET","VFC","VG","VGI","VGM","VHI","VIA","VICI","VIK","VIPS","VIRT","VIST","VIV","VKQ","VLN","VLN.W","VLO","VLRS","VLT","VLTO","VMC","VMI","VMO","VNO","VNO$L","VNO$M","VNO$N","VNO$O","VNT","VOC","VOYA","VOYA$B","VOYG","VPG","VPV","VRE","VRT","VRTS","VSCO","VSH","VST","VSTS","VTEX","VTMX","VTN","VTOL","VTR","VTS","VVR","VVV","VVX","VYX","VZ","W","WAB","WAL","WAL$A","WAT","WBI","WBIY","WBS","WBS$F","WBS$G","WBX","WCC","WCN","WD","WDH","WDI","WDS","WEA","WEAV","WEC","WELL","WES","WEX","WF","WFC","WFC$A","WFC$C","WFC$D","WFC$L","WFC$Y","WFC$Z","WFG","WGO","WH","WHD","WHG","WHR","WIA","WINN","WIT","WIW","WK","WKC","WLK","WLKP","WLTG","WLY","WLYB","WM","WMB","WMK","WMS","WNC","WOLF","WOR","WPC","WPM","WPP","WRB","WRB$E","WRB$F","WRB$G","WRB$H","WRBY","WS","WSM","WSO","WSO.B","WSR","WST","WT","WTI","WTM","WTRG","WTS","WTTR","WU","WWW","WY","XFLT","XHR","XIFR","XOM","XPER","XPEV","XPO","XPOF","XPRO","XXI","XYF","XYL","XYZ","XZO","YALA","YCY","YCY.U","YCY.W","YELP","YETI","YEXT","YMM","YOU","YPF","YRD","YSG","YUM","YUMC","ZBH","ZEPP","ZETA","ZGN","ZH","ZIM","ZIP","ZKH","ZTO","ZTR","ZTS","ZVIA","ZWS"]
 
 
+async def main():
+    # One event loop and one HTTP session for the whole sweep instead of an
+    # asyncio.run() (and fresh loop) per ticker.
+    sem = asyncio.Semaphore(MAX_CONCURRENT_TICKERS)
+
+    async def scan(ticker):
+        async with sem:
+            return await find_fly(ticker, client, None, verbose=False)
+
+    rejects = _load_rejects()
+    tickers = [t for t in big_list if t not in rejects]
+
+    async with TradierClient(api_key=TRADIER_API_KEY) as client:
+        results = await asyncio.gather(*(scan(t) for t in tickers), return_exceptions=True)
+
+    # Collect every hit and write it in one go instead of a print() per line
+    # interleaving across concurrently running tickers.
+    today = date.today().isoformat()
+    out = [f"Skipping {len(big_list) - len(tickers)} tickers with no fly in the last {REJECT_TTL_DAYS} days"]
+    for ticker, result in zip(tickers, results):
+        if isinstance(result, Exception):
+            out.append(f"{ticker}: {result}")
+        elif result:
+            out.extend(result)
+        elif result == []:
+            # Only a ticker that was actually scored counts as a reject; None
+            # (e.g. a missed spot quote) is retried on the next sweep.
+            rejects[ticker] = today
+    _save_rejects(rejects)
+    sys.stdout.write("\n".join(out) + "\n")
+
+
 if __name__ == "__main__":
-    asyncio.run(find_fly('MMM', None, verbose=False))
-    for ticker in big_list:
-        #   print(ticker)
-          asyncio.run(find_fly(ticker, None, verbose=False))
-        
\ No newline at end of file
+    asyncio.run(main())
@@ -1,55 +1,13 @@
 import os, asyncio
-import aiohttp
 from typing import List, Dict, Any, Optional
-from lib.commons.bs import implied_vol
+from lib.commons.bs import implied_vols
 from lib.commons.list_contracts import list_contracts_for_expiry
 from lib.commons.get_underlying_price import get_underlying_price
-from datetime import datetime, date
+from lib.commons.list_expirations import list_expirations
+from lib.tradier.tradier_client_wrapper import TradierClient
+from datetime import date
 
 TRADIER_API_KEY = os.getenv("TRADIER_API_KEY")
-TRADIER_ENDPOINT = "https://api.tradier.com/v1"
-TRADIER_REQUEST_HEADERS = {
-    "Authorization": f"Bearer {TRADIER_API_KEY}", 
-    "Accept": "application/json"
-}
-
-async def _list_expirations(
-        ticker:str
-):
-    url = f"{TRADIER_ENDPOINT}/markets/options/expirations"
-    params =  {
-        "symbol"
-    }
-    session = aiohttp.ClientSession(
-        headers = TRADIER_REQUEST_HEADERS
-    )
-    try:
-        params = {
-            "symbol":ticker,
-            "includeAllRoots" : "true",
-            "strikes" : "false",
-            "contractSize" : "false",
-            "expirationType" : "false",
-        }
-        async with session.get(url, params = params) as resp:
-            resp.raise_for_status()
-            data = await resp.json()
-            exp_root = (data or {}).get("expirations") or {}
-            dates: List[str] = []
-            maybe_dates = exp_root.get("date")
-            if maybe_dates:
-                dates = [str(d) for d in (maybe_dates if isinstance(maybe_dates, list) else [maybe_dates])]
-            else:
-                exps = exp_root.get("expiration")
-                if exps:
-                    if isinstance(exps,dict):
-                        exps = [exps]
-                    dates = [str(x.get("date")) for x in exps if x.get("date")]
-            return sorted(set(filter(None,dates)))
-    finally:
-        await session.close()
-    
-
 
 
 def nearest_strike_contract(contracts, spot, cp):
@@ -60,23 +18,26 @@ def nearest_strike_contract(contracts, spot, cp):
 
 def dte(expiration_date_str:str)->int:
     today = date.today()
-    expiration = datetime.strptime(expiration_date_str, "%Y-%m-%d").date()
+    expiration = date.fromisoformat(expiration_date_str)
     return (expiration-today).days
 
 async def test():
     ticker = "WBD"
     front_expiration_date = '2025-11-14'
     back_expiration_date = '2025-12-19'
-    # Step 1: get price of underlying
-    spot = await get_underlying_price(ticker)
+    # One keep-alive session for every Tradier call below, instead of a fresh
+    # ClientSession (and TCP+TLS handshake) per request.
+    async with TradierClient(api_key=TRADIER_API_KEY) as client:
+        # Step 1: price of underlying, Step 2: available expirations, Step 3: the
+        # front and back chains. None depend on each other, so issue them together.
+        spot, exps, front_contracts, back_contracts = await asyncio.gather(
+            get_underlying_price(ticker, client=client),
+            list_expirations(ticker, client=client),
+            list_contracts_for_expiry(ticker, front_expiration_date, client=client),
+            list_contracts_for_expiry(ticker, back_expiration_date, client=client),
+        )
     print(spot)
-
-    # Step 2: get dates of available options for a symbol
-    exps = await _list_expirations(ticker)
     print(exps)
-    # Step 3: Given two dates, get the ATM contracts
-    front_contracts = await list_contracts_for_expiry(ticker, front_expiration_date)
-    back_contracts = await list_contracts_for_expiry(ticker,back_expiration_date)
     
     # print(contracts)
     front_call_contract = nearest_strike_contract(front_contracts, spot, "call")
@@ -108,16 +69,24 @@ async def test():
     ff_var_sq = max(ff_var_sq, 0)
     ff_var = ff_var_sq ** 0.5
     
-    bid_iv = implied_vol(
-    price=0.35,
-    S=18.591,     # spot aligned to the quote timestamp
-    K=18.5,
-    T=1/252,      # or your precise ACT/365—just be consistent
-    r=0.0,
-    q=0.0,
-    opt_type="call"
-)
-    print(f"bid_iv={bid_iv}")
+    # Step 4: bid and ask vols for those strikes, all eight quotes in one vectorized
+    # solve instead of a scalar root-find per quote.
+    legs = [
+        (front_call_contract, dte_front), (front_put_contract, dte_front),
+        (back_call_contract, dte_back), (back_put_contract, dte_back),
+    ]
+    quotes = [(c, d, side) for c, d in legs for side in ("bid", "ask")]
+    ivs = implied_vols(
+        price=[c[side] for c, _, side in quotes],
+        S=spot,       # spot aligned to the quote timestamp
+        K=[c["strike"] for c, _, _ in quotes],
+        T=[d / 365 for _, d, _ in quotes],   # ACT/365—just be consistent
+        r=0.0,
+        q=0.0,
+        opt_type=[c["option_type"] for c, _, _ in quotes],
+    )
+    for (c, _, side), iv in zip(quotes, ivs):
+        print(f"{c["symbol"]} {side}_iv={iv}")
 
     print(f"ff={ff_var}")
 
@@ -6,16 +6,20 @@ Two-step process:
   2. GetStatement — poll with ReferenceCode until the statement is ready
 
 Usage:
-    xml_text = fetch_flex_query(from_date="20260101", to_date="20260224")
-    dfs      = parse_flex_xml(xml_text)   # dict of { element_name -> DataFrame }
+    xml_data = fetch_flex_query(from_date="20260101", to_date="20260224")   # raw XML bytes
+    dfs      = parse_flex_xml(xml_data)   # dict of { element_name -> DataFrame }
 
 Run as script for a quick test:
     IBKR_FLEX_TOKEN=<token> PYTHONPATH=src python -m lib.ibkr.flex_client
 """
 
+import gzip
 import os
+import random
 import time
+from io import BytesIO
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 from pathlib import Path
 
@@ -23,6 +27,7 @@ import pandas as pd
 import requests
 
 OUTPUT_DIR = Path(__file__).resolve().parents[3] / "src" / "lib" / "output" / "ibkr"
+CACHE_DIR  = OUTPUT_DIR / "cache"   # gzipped statements for closed date ranges
 
 # ── Endpoints ────────────────────────────────────────────────────────────────
 SEND_URL = (
@@ -36,8 +41,10 @@ GET_URL = (
 
 QUERY_ID      = "1415008"
 VERSION       = "3"
-POLL_INTERVAL = 5    # seconds between polls
-MAX_POLLS     = 36   # give up after 3 minutes
+POLL_INTERVAL     = 1     # first retry delay (seconds); grows 1.5x per poll
+POLL_INTERVAL_MAX = 8     # cap on the retry delay
+POLL_TIMEOUT      = 180   # give up after 3 minutes
+CSV_WORKERS   = 8    # threads writing section CSVs in save_flex_results
 
 HEADERS = {"User-Agent": "python-requests/2.0"}
 
@@ -67,39 +74,55 @@ def _send_request(token: str, from_date: str, to_date: str) -> str:
     return ref_code
 
 
-def _get_statement(token: str, ref_code: str, request_ts: datetime) -> tuple[str, float]:
+def _get_statement(token: str, ref_code: str, request_ts: datetime) -> tuple[bytes, float]:
     """Poll the GetStatement endpoint until the statement XML is ready.
 
     Returns:
-        (xml_text, lag_seconds) where lag_seconds is time from SendRequest to
+        (xml_bytes, lag_seconds) where lag_seconds is time from SendRequest to
         first successful GetStatement response.
     """
-    for attempt in range(1, MAX_POLLS + 1):
+    # Exponential backoff with a little jitter: small statements are picked up within
+    # a second or two, large ones are polled less often, total wait stays bounded.
+    delay = POLL_INTERVAL
+    deadline = time.monotonic() + POLL_TIMEOUT
+    attempt = 0
+    while True:
+        attempt += 1
         poll_ts = datetime.now()
-        resp = requests.get(
+        # Stream the body in chunks and keep it as bytes: no decoded str copy of a
+        # multi-MB statement, and parse_flex_xml iterparses these bytes directly.
+        with requests.get(
             GET_URL,
             params={"q": ref_code, "t": token, "v": VERSION},
             headers=HEADERS,
             timeout=60,
-        )
-        resp.raise_for_status()
-        text = resp.text.strip()
+            stream=True,
+        ) as resp:
+            resp.raise_for_status()
+            body = b"".join(resp.iter_content(chunk_size=65536))
+        if body[:1].isspace() or body[-1:].isspace():
+            body = body.strip()
 
         # Still generating — wait and retry
-        if "Statement generation in progress" in text or "<Status>Processing</Status>" in text:
+        if b"Statement generation in progress" in body or b"<Status>Processing</Status>" in body:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            wait = min(delay + random.uniform(0, 0.25 * delay), remaining)
             elapsed = (poll_ts - request_ts).total_seconds()
-            print(f"  [{attempt}/{MAX_POLLS}] Generating... ({elapsed:.1f}s elapsed) retrying in {POLL_INTERVAL}s")
-            time.sleep(POLL_INTERVAL)
+            print(f"  [{attempt}] Generating... ({elapsed:.1f}s elapsed) retrying in {wait:.1f}s")
+            time.sleep(wait)
+            delay = min(POLL_INTERVAL_MAX, delay * 1.5)
             continue
 
         # Explicit failure
-        if "<Status>Fail</Status>" in text or "ErrorCode" in text:
-            raise RuntimeError(f"GetStatement returned an error:\n{text[:500]}")
+        if b"<Status>Fail</Status>" in body or b"ErrorCode" in body:
+            raise RuntimeError(f"GetStatement returned an error:\n{body[:500].decode(errors='replace')}")
 
         lag = (datetime.now() - request_ts).total_seconds()
-        return text, lag
+        return body, lag
 
-    raise RuntimeError(f"GetStatement timed out after {MAX_POLLS} polls ({MAX_POLLS * POLL_INTERVAL}s)")
+    raise RuntimeError(f"GetStatement timed out after {attempt} polls ({POLL_TIMEOUT}s)")
 
 
 # ── Public API ────────────────────────────────────────────────────────────────
@@ -108,42 +131,62 @@ def fetch_flex_query(
     from_date: str | None = None,
     to_date: str | None = None,
     token: str | None = None,
-) -> str:
+    force_refresh: bool = False,
+) -> bytes:
     """
-    Fetch IBKR Flex query results as a raw XML string.
+    Fetch IBKR Flex query results as raw XML bytes.
+
+    Statements whose range ends before today can no longer change, so they are
+    cached on disk under CACHE_DIR and later calls for the same range skip IBKR.
 
     Args:
         from_date: Start date in YYYYMMDD format. Defaults to today.
         to_date:   End date in YYYYMMDD format. Defaults to today.
         token:     Flex token. Defaults to IBKR_FLEX_TOKEN env var.
+        force_refresh: Ignore any cached copy and fetch from IBKR.
 
     Returns:
-        Raw XML string of the Flex statement.
+        Raw XML bytes of the Flex statement (undecoded; parse_flex_xml and
+        save_flex_results take them as-is).
     """
-    token = token or os.environ.get("IBKR_FLEX_TOKEN")
-    if not token:
-        raise RuntimeError("IBKR_FLEX_TOKEN environment variable is not set")
-
     today = date.today().strftime("%Y%m%d")
     from_date = from_date or today
     to_date   = to_date   or today
 
+    cacheable = to_date < today
+    cache_path = CACHE_DIR / f"{QUERY_ID}_{from_date}_{to_date}.xml.gz"
+    if cacheable and not force_refresh and cache_path.exists():
+        print(f"Using cached Flex statement {cache_path.name}")
+        return gzip.decompress(cache_path.read_bytes())
+
+    token = token or os.environ.get("IBKR_FLEX_TOKEN")
+    if not token:
+        raise RuntimeError("IBKR_FLEX_TOKEN environment variable is not set")
+
     print(f"Submitting Flex query {QUERY_ID}  {from_date} → {to_date} ...")
     request_ts = datetime.now()
     ref_code = _send_request(token, from_date, to_date)
     print(f"  ReferenceCode: {ref_code}  (submitted at {request_ts.strftime('%H:%M:%S')})")
 
     print("Retrieving statement ...")
-    xml_text, lag = _get_statement(token, ref_code, request_ts)
+    xml_data, lag = _get_statement(token, ref_code, request_ts)
     retrieved_ts = datetime.now()
     print(f"  Done.  Lag: {lag:.1f}s  (retrieved at {retrieved_ts.strftime('%H:%M:%S')})")
 
-    return xml_text
+    if cacheable:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_bytes(gzip.compress(xml_data, compresslevel=6))
+        tmp_path.replace(cache_path)
+
+    return xml_data
 
 
-def parse_flex_xml(xml_text: str) -> dict[str, pd.DataFrame]:
+def parse_flex_xml(source) -> dict[str, pd.DataFrame]:
     """
-    Parse a Flex statement XML string into a dict of DataFrames.
+    Parse a Flex statement into a dict of DataFrames. `source` may be the XML as
+    bytes or str, or a binary file-like object (e.g. an open raw.xml), which is
+    streamed without loading it whole.
 
     Each distinct child element tag within <FlexStatement> becomes a key,
     and all elements of that tag are collected into a DataFrame (attributes
@@ -154,8 +197,6 @@ def parse_flex_xml(xml_text: str) -> dict[str, pd.DataFrame]:
     Returns:
         { element_tag: pd.DataFrame }
     """
-    root = ET.fromstring(xml_text)
-
     # Flex XML structure:
     #   <FlexQueryResponse>
     #     <FlexStatements count="N">
@@ -167,20 +208,70 @@ def parse_flex_xml(xml_text: str) -> dict[str, pd.DataFrame]:
     #     </FlexStatements>
     #   </FlexQueryResponse>
 
-    records: dict[str, list[dict]] = {}
+    # Built column-wise ({tag: {attr: [values]}}) so each DataFrame is made from one
+    # list per column instead of pandas pivoting thousands of row dicts. Attributes a
+    # record lacks are padded with None, as pd.DataFrame(list_of_dicts) would.
+    columns: dict[str, dict[str, list]] = {}
+    counts: dict[str, int] = {}
+
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+
+    for tag, attrib in _iter_flex_records(source):
+        if tag not in columns:
+            columns[tag] = {}
+            counts[tag] = 0
+        cols = columns[tag]
+        n = counts[tag]
+        for k, v in attrib.items():
+            col = cols.get(k)
+            if col is None:
+                col = cols[k] = [None] * n
+            col.append(v)
+        n += 1
+        counts[tag] = n
+        if len(attrib) != len(cols):
+            for col in cols.values():
+                if len(col) < n:
+                    col.append(None)
+
+    return {
+        tag: pd.DataFrame(cols, index=pd.RangeIndex(counts[tag]))
+        for tag, cols in columns.items() if counts[tag]
+    }
+
+
+def _iter_flex_records(source):
+    """
+    Stream (tag, attributes) for every record element (FlexStatement > section > record)
+    in a Flex XML file-like object.
 
-    for stmt in root.iter("FlexStatement"):
-        for section in stmt:
-            for element in section:
-                tag = element.tag
-                if tag not in records:
-                    records[tag] = []
-                records[tag].append(element.attrib)
+    Uses iterparse and clears each record and section once read, so a large statement
+    is never held as a full element tree alongside the parsed rows.
+    """
+    depth = 0
+    stmt_depth = None
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if stmt_depth is None and elem.tag == "FlexStatement":
+                stmt_depth = depth
+            continue
 
-    return {tag: pd.DataFrame(rows) for tag, rows in records.items() if rows}
+        if stmt_depth is not None:
+            if depth == stmt_depth + 2:
+                yield elem.tag, dict(elem.attrib)
+                elem.clear()
+            elif depth == stmt_depth + 1:
+                elem.clear()
+            elif depth == stmt_depth:
+                stmt_depth = None
+        depth -= 1
 
 
-def save_flex_results(dfs: dict[str, pd.DataFrame], xml_text: str, from_date: str, to_date: str) -> Path:
+def save_flex_results(dfs: dict[str, pd.DataFrame], xml_data: bytes | str, from_date: str, to_date: str) -> Path:
     """
     Save parsed DataFrames as CSVs and raw XML to src/lib/output/ibkr/.
     Files are timestamped so repeated runs don't overwrite each other.
@@ -193,14 +284,23 @@ def save_flex_results(dfs: dict[str, pd.DataFrame], xml_text: str, from_date: st
 
     # Save raw XML
     xml_path = run_dir / "raw.xml"
-    xml_path.write_text(xml_text, encoding="utf-8")
+    if isinstance(xml_data, str):
+        xml_path.write_text(xml_data, encoding="utf-8")
+    else:
+        xml_path.write_bytes(xml_data)
     print(f"  Raw XML → {xml_path}")
 
-    # Save each DataFrame as CSV
-    for name, df in dfs.items():
+    # Save each DataFrame as CSV. The writes are independent file I/O, so run them
+    # on a small thread pool; map() keeps the log in section order.
+    def _write_one(item):
+        name, df = item
         csv_path = run_dir / f"{name}.csv"
         df.to_csv(csv_path, index=False)
-        print(f"  {name:30s} {len(df):>6} rows → {csv_path.name}")
+        return name, len(df), csv_path
+
+    with ThreadPoolExecutor(max_workers=CSV_WORKERS) as ex:
+        for name, n_rows, csv_path in ex.map(_write_one, dfs.items()):
+            print(f"  {name:30s} {n_rows:>6} rows → {csv_path.name}")
 
     return run_dir
 
@@ -213,9 +313,9 @@ if __name__ == "__main__":
     from_date = sys.argv[1] if len(sys.argv) > 1 else None
     to_date   = sys.argv[2] if len(sys.argv) > 2 else None
 
-    xml_text = fetch_flex_query(from_date=from_date, to_date=to_date)
+    xml_data = fetch_flex_query(from_date=from_date, to_date=to_date)
 
-    dfs = parse_flex_xml(xml_text)
+    dfs = parse_flex_xml(xml_data)
     if not dfs:
         print("No data returned.")
         sys.exit(0)
@@ -225,5 +325,5 @@ if __name__ == "__main__":
         print(f"  {name:30s} {len(df):>6} rows  {len(df.columns)} columns")
 
     print("\nSaving output ...")
-    run_dir = save_flex_results(dfs, xml_text, from_date or "today", to_date or "today")
+    run_dir = save_flex_results(dfs, xml_data, from_date or "today", to_date or "today")
     print(f"\nAll files saved to: {run_dir}")
@@ -1,12 +1,13 @@
 import os, asyncio
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from lib.commons.get_underlying_price import get_underlying_price
 
 from lib.commons.volume_breakout import volume_confirmation_eod
 from lib.commons.list_expirations import list_expirations
 from lib.commons.pivot_detector import pivot_signal_eod_trading_days
-from lib.commons.moving_averages import get_sma, sma_trending_up_trading_days
-from lib.commons.high_low import get_52w_high_low
+from lib.commons.moving_averages import moving_averages_from_bars, sma_trend_from_bars
+from lib.commons.high_low import high_low_from_bars
+from lib.commons.daily_bars import get_daily_bars
 from lib.commons.vol_compression import volatility_compression_trading_days
 from dateutil.relativedelta import relativedelta
 from lib.commons.list_contracts import list_contracts_for_expiry
@@ -20,6 +21,66 @@ TRADIER_REQUEST_HEADERS = {
     "Accept": "application/json"
 }
 
+# Tickers screened concurrently; TradierClient's connector caps open sockets at 50.
+MAX_CONCURRENT_TICKERS = 10
+# Calendar days of daily bars behind every SEPA rule: SMA200 plus the 105-day trend lookback.
+SEPA_HISTORY_DAYS = 520
+
+async def sepa_rules(t, ticker, pivot_result):
+    """
+    Minervini SEPA trend-template check for one ticker. Not called from main() at the
+    moment, which only screens for pivots.
+
+    Spot and a single daily-history request feed every rule. Rules are checked
+    cheapest first and the ticker is dropped at the first failure.
+    """
+    end = date.today()
+    sym = ticker.strip().upper()
+    spot, bars = await asyncio.gather(
+        get_underlying_price(ticker, client=t),
+        get_daily_bars(t, sym, (end - timedelta(days=SEPA_HISTORY_DAYS)).isoformat(), end.isoformat()),
+    )
+    if spot is None:
+        return False
+
+    ma = moving_averages_from_bars(sym, bars)
+    if ma.sma_150 is None or ma.sma_200 is None:
+        return False
+    # Rule 1: price above the 150- and 200-day
+    if not (spot > ma.sma_150 and spot > ma.sma_200):
+        return False
+    # Rule 2: 150-day above the 200-day
+    if not ma.sma_150 > ma.sma_200:
+        return False
+    # Rule 4: 50-day above the 150- and 200-day
+    if not (ma.sma_50 > ma.sma_150 and ma.sma_50 > ma.sma_200):
+        return False
+    # Rule 5: price above the 50-day
+    if not spot > ma.sma_50:
+        return False
+
+    rng = high_low_from_bars(sym, bars, (end - timedelta(days=365)).isoformat(), end.isoformat())
+    if rng.low_52w is None:
+        return False
+    # Rule 6: at least 30% above the 52-week low
+    if not spot >= 1.3 * rng.low_52w:
+        return False
+    # Rule 7: within 25% of the 52-week high
+    if not spot >= 0.75 * rng.high_52w:
+        return False
+
+    # Rule 3: 200-day trending up over 1 and 5 months. The rolling SMA is the most
+    # work, so it runs last.
+    if not sma_trend_from_bars(sym, bars, lookback_trading_days=21).is_up:
+        return False
+    if not sma_trend_from_bars(sym, bars, lookback_trading_days=105, min_delta_pct=0.01).is_up:
+        return False
+    #and volume_result.signal
+
+    print(f"{ticker} passes sepa, pivot signal {pivot_result.signal}, overextended {pivot_result.extended}")
+    return True
+
+
 async def main():
     async with TradierClient(api_key=TRADIER_API_KEY) as t:
         vic_list = ["BCP", "SE", "WSM", "HON", "UDMY", "CABA", 
@@ -55,9 +116,13 @@ async def main():
             "ENTG", "BSAC"
         ]
 
-        i=0;
-        for ticker in nyse_list:
+        # Tickers are independent; keep up to MAX_CONCURRENT_TICKERS pivot screens
+        # in flight on the shared session instead of awaiting them one by one.
+        sem = asyncio.Semaphore(MAX_CONCURRENT_TICKERS)
+        done = 0
 
+        async def screen(ticker):
+            nonlocal done
             # vcp_result = await volatility_compression_trading_days(t,ticker)
             # if not vcp_result.is_compressing:
             #     continue
@@ -70,50 +135,20 @@ async def main():
             # vcp_result.avg_range_20,
             # vcp_result.avg_range_60)
             # volume_result = await volume_confirmation_eod(t, ticker, avg_volume_lookback=50, vol_mult=1.5)
-            pivot_result = await pivot_signal_eod_trading_days(t, ticker)
-            if (i % 100 == 0):
-                print(i)
-            if pivot_result.signal:
-                print(f"{ticker} passes sepa, pivot signal {pivot_result.signal}, overextended {pivot_result.extended}")
+            async with sem:
+                pivot_result = await pivot_signal_eod_trading_days(t, ticker)
+            if (done % 100 == 0):
+                print(done)
+            done += 1
+            return pivot_result
 
-            i= i+1;
-            continue;
-            ma = await get_sma(t, ticker)
-            rng = await get_52w_high_low(t, ticker)
-            spot = await get_underlying_price(ticker, client=t)
-            trend_1m = await sma_trending_up_trading_days(t, ticker, lookback_trading_days=21)
-            trend_5m = await sma_trending_up_trading_days(t, ticker, lookback_trading_days=105, min_delta_pct=0.01)
-            if ma.sma_150 is None or ma.sma_200 is None or rng.low_52w is None:
+        results = await asyncio.gather(*(screen(x) for x in nyse_list), return_exceptions=True)
+        for ticker, pivot_result in zip(nyse_list, results):
+            if isinstance(pivot_result, Exception):
+                print(f"{ticker}: {pivot_result}")
                 continue
-            
-            passesRule1= ma.sma_150 is not None and spot > ma.sma_150 and spot > ma.sma_200
-            passesRule2 = ma.sma_150 is not None and ma.sma_200 is not None and ma.sma_150 > ma.sma_200
-            passesRule3 = trend_1m.is_up and trend_5m.is_up
-            passesRule4 = ma.sma_50 > ma.sma_150 and ma.sma_50 > ma.sma_200
-            passesRule5 = spot > ma.sma_50
-            passesRule6 = spot >= 1.3 * rng.low_52w
-            passesRule7 = spot >= 0.75 * rng.high_52w
-           
-            passesAllRules = passesRule1 and passesRule2 and passesRule3 and passesRule4 and passesRule5 and passesRule6 and passesRule7 
-            #and volume_result.signal
-            
-            color = 'GREEN' if passesAllRules else 'RED'
-    
-            
-            if passesAllRules:
+            if pivot_result.signal:
                 print(f"{ticker} passes sepa, pivot signal {pivot_result.signal}, overextended {pivot_result.extended}")
-                #print(f"{ticker} {color} vcp: {vcp_result.is_compressing}")
-                # print(f"{ticker} {color} volume: {volume_result.signal} vcp: {vcp_result.is_compressing}")
-                
-            # print(f"Rule 1 {passesRule1}")
-            # print(f"Rule 2 {passesRule2}")
-            # print(f"Rule 3 {passesRule3}")
-            # print(f"Rule 4 {passesRule4}")
-            # print(f"Rule 5 {passesRule5}")
-            # print(f"Rule 6 {passesRule6}")
-            # print(f"Rule 7 {passesRule7}")
-            # print("")
-
 
 
 asyncio.run(main())
\ No newline at end of file
@@ -1,11 +1,20 @@
-import os, asyncio
-from datetime import datetime, date
-from lib.commons.get_underlying_price import get_underlying_price
+import os, sys, asyncio
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import lru_cache
+from itertools import repeat
+from operator import itemgetter
+from pathlib import Path
+from typing import NamedTuple
+import numpy as np
+import orjson
+from lib.commons.get_underlying_price import get_underlying_price, get_underlying_prices
 
 from lib.commons.list_expirations import list_expirations
 from dateutil.relativedelta import relativedelta
 from lib.commons.nyse_arca_list import nyse_arca_list, ravish_list, vrp_list, vrp_list2, nasdaq_list
-from lib.commons.list_contracts import list_contracts_for_expiry
+from lib.commons.list_contracts import list_chain_for_expiry, nearest_strike
 from lib.tradier.tradier_client_wrapper import TradierClient
 
 # This module identifies opportunities for LEAP collar plays: long 100 shares, a protective ATM put, and a covered call.
@@ -15,6 +24,29 @@ MAX_ANNUALIZED_BE_DRIFT = 8
 MIN_ANNUALIZED_MAX_RETURN =  50.0
 MIN_ANNUALIZED_MIN_RETURN = -12
 MIN_REWARD_TO_RISK = 3
+# Underlyings priced above this are skipped.
+MAX_SPOT = 30
+# The only contract keys analyze/find_best_leap read; chains are projected to these
+# at ingestion instead of building the full normalized record per contract.
+LEAP_FIELDS = (
+    "option_type", "strike", "bid", "ask", "mid", "volume", "open_interest", "last",
+    "root_symbol", "underlying",
+)
+# Skip the ticker if the nearest valid expiry has less total open interest than this.
+MIN_PROBE_OPEN_INTEREST = 1000
+
+# Tickers screened concurrently within each worker process, and chain fetches in
+# flight per ticker.
+MAX_CONCURRENT_TICKERS = 5
+MAX_CONCURRENT_EXPIRATIONS = 8
+
+# Processes splitting the ticker universe in main(); each runs its own event loop and
+# TradierClient. Capped so the requests in flight across workers stay polite to the API.
+SCREEN_WORKERS = min(4, os.cpu_count() or 1)
+
+# Expiration lists are stable within a day; re-runs of the screen read them from disk.
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+_EXP_CACHE_DIR = _REPO_ROOT / "data" / "cache" / "expirations"
 
 
 
@@ -25,188 +57,338 @@ TRADIER_REQUEST_HEADERS = {
     "Accept": "application/json"
 }
 
-def find_call(spot, contracts, atm_put_contract):
-    put_bid, put_ask = atm_put_contract["bid"], atm_put_contract["ask"]
-    Kp = atm_put_contract["strike"]
-    put_mid = (put_bid + put_ask) /2
-   
-    calls = [c for c in contracts if c.get("option_type").lower() == "call"]
-    eligible = []
-    
-    
-    for c in calls:
-        bid, ask = c.get("bid"), c.get("ask")
-        Kc = c["strike"]
-        if bid is None or ask is None:
-            continue
-        call_mid = (bid + ask) / 2
-        net_credit = call_mid - put_mid
-        min_profit = -1*(spot - Kp - net_credit) * 100.0
-     
-     
-        if min_profit >=0:
-           eligible.append((call_mid,c))
-    
-    if not eligible:
+def find_call(spot, calls, atm_put_strike, put_mid):
+    """
+    Cheapest call (by mid) whose credit makes the collar's worst case break even,
+    i.e. min_profit >= 0 against the ATM put. `calls` is the call side's LegColumns;
+    returns (strike, mid) of the first such call, or None.
+    """
+    net_credit = calls.mid - put_mid
+    with np.errstate(invalid="ignore"):
+        ok = -1*(spot - atm_put_strike - net_credit) * 100.0 >= 0   # NaN mids compare False
+    if not ok.any():
         return None
-    call =  min(
-        eligible,
-        key = lambda x:x[0]
-    )[1]
-    call_mid = (call["bid"] + call["ask"])/ 2
-
-    return call
+    # Ineligible calls are masked to +inf, so one argmin lands on the first cheapest
+    # eligible call without compressing the arrays first.
+    i = int(np.argmin(np.where(ok, calls.mid, np.inf)))
+    return float(calls.strike[i]), float(calls.mid[i])
 
 def spread_pct(contract):
-    mid = (contract["bid"] + contract["ask"]) / 2
-    return (contract["ask"] - contract["bid"]) / mid
+    return (contract["ask"] - contract["bid"]) / contract["mid"]
 
-async def analyze(ticker,client, expiry, spot,  global_min_roi, verbose = False):
-    dte = ((datetime.strptime(expiry, "%Y-%m-%d")).date() - date.today()).days
+async def analyze(ticker,client, expiry, dte, spot,  global_min_roi, verbose = False):
     
     #spot = await get_underlying_price(ticker)
     #spot = 15.28
     #contracts = await list_contracts_for_expiry(ticker, expiry)
-    contracts = await list_contracts_for_expiry(ticker, expiry, client=client, include_greeks=True)
+    # The chain arrives already split; find_call and the pair screen reuse both sides.
+    # Nothing here reads greeks; leaving them out roughly halves the chain payload.
+    sides = await list_chain_for_expiry(ticker, expiry, client=client, include_greeks=False, fields=LEAP_FIELDS)
     
-    if contracts is None:
-        return
     if verbose:
         print(f"underlying spot={round(spot,2)}")
     tie_breaker = "higher"
     
     
-    put_contracts = [c for c in contracts if c.get("option_type").lower() == "put"]
-    call_contracts = [c for c in contracts if c.get("option_type").lower() == "call"]
+    put_contracts, call_contracts = sides.puts, sides.calls
     
     tie_breaker = "higher"
     prefer_high = (tie_breaker != "lower")
-    if not put_contracts:
+    # Strikes are sorted, so the ATM put is a bisect rather than a keyed scan.
+    atm_strike = nearest_strike(sides.put_strikes, spot, prefer_high)
+    if atm_strike is None:
         return
-    atm_put_contract = min(
-        put_contracts,
-        key = lambda c: (
-            abs(c["strike"]- spot),
-            0 if (c["strike"] >= spot) == prefer_high else 1,
-            c["strike"] if prefer_high else -c["strike"]
-        )
-    )
-    put_bid, put_ask = atm_put_contract["bid"], atm_put_contract["ask"]
-    if put_bid is None or put_ask is None:
+    atm_put_contract = put_contracts[bisect_left(sides.put_strikes, atm_strike)]
+    atm_put_contract_strike = atm_put_contract["strike"]
+    atm_put_mid = atm_put_contract["mid"]
+    if atm_put_mid is None:
         return
-    put_mid = (put_bid + put_ask) /2
-    breakeven_call_contract = find_call(spot, contracts, atm_put_contract)
-    if breakeven_call_contract is None:
+
+    # find_call needs every call; the pair screen reuses those columns.
+    calls = _columns(call_contracts)
+    breakeven_call = find_call(spot, calls, atm_put_contract_strike, atm_put_mid)
+    if breakeven_call is None:
         return
-    breakeven_call_contract_strike = breakeven_call_contract["strike"]
-    atm_put_contract_strike = atm_put_contract["strike"]
+    breakeven_call_contract_strike, breakeven_call_mid = breakeven_call
 
     if verbose:
-        # print(f"atm put strike ={atm_put_contract["strike"]}, price = {put_mid}")
-        # print(f"call strike = {breakeven_call_contract_strike}")
+        # print(f"atm put strike ={atm_put_contract_strike}, price = {atm_put_mid}")
+        # print(f"call strike = {breakeven_call_contract_strike}, price = {breakeven_call_mid}")
         print(f"{ticker}, {expiry}")
-    for call_contract in call_contracts:
-        if call_contract["strike"] < breakeven_call_contract_strike:
-            continue
-        for put_contract in put_contracts:
-            if put_contract["strike"] > atm_put_contract_strike or put_contract["strike"]>=call_contract["strike"]:
-                continue
-            if put_contract["bid"]==0 or call_contract["bid"]==0:
-                continue
-            if spread_pct(put_contract) > 0.35 or spread_pct(call_contract) > 0.35:
-                continue
-            if (call_contract["volume"]==0 and call_contract["open_interest"] < 50 and 
-                (call_contract["last"] is not None and call_contract["ask"] > 2 * call_contract["last"]) and call_contract["ask"] > 5 * call_contract["bid"]
-            ):
-                continue
-            if put_contract["bid"] is None or put_contract["ask"] is None or call_contract["bid"] is None or call_contract["ask"] is None:
-                continue
-            if put_contract["root_symbol"] != put_contract["underlying"] or call_contract["root_symbol"] != call_contract["underlying"]:
-                continue
-            global_min_roi = profitability(ticker, spot, call_contract, put_contract, dte, global_min_roi,  verbose)
+
+    # Strikes are sorted, so the strike bounds are bisects that slice each side;
+    # the remaining per-contract filters run once per leg (O(P+C)) as column masks.
+    # Only the pair math is O(P×C), done as NumPy broadcasts in profitability().
+    call_strikes, put_strikes = sides.call_strikes, sides.put_strikes
+    start_c = bisect_left(call_strikes, breakeven_call_contract_strike)
+    end_p = bisect_right(put_strikes, atm_put_contract_strike)
+    # A collar needs Kp < Kc, so calls at or below the lowest put strike and puts at
+    # or above the highest call strike have no partner; trim them from the slices too.
+    start_c = max(start_c, bisect_right(call_strikes, put_strikes[0]))
+    end_p = min(end_p, bisect_left(put_strikes, call_strikes[-1]))
+    calls = LegColumns._make(col[start_c:] for col in calls)
+    puts = _columns(put_contracts[:end_p])
+    call_ok = _tradeable(calls) & ~_illiquid_call(calls)
+    put_ok = _tradeable(puts)
+    if not call_ok.any() or not put_ok.any():
+        return global_min_roi
+
+    Kp, put_mid = puts.strike[put_ok], puts.mid[put_ok]
+    Kc, call_mid = calls.strike[call_ok], calls.mid[call_ok]
+
+    # Drop legs that cannot clear the return thresholds with any partner before the
+    # O(P×C) sweep. Per share, max return = Kc/cost - 1 and min return = Kp/cost - 1
+    # with cost = spot + put_mid - call_mid, so each leg is bounded by the cheapest
+    # cost its best possible partner allows.
+    years = 365.0 / dte   # annualizing exponent, shared with profitability()
+    keep_c = _can_clear(Kc, spot + put_mid.min() - call_mid, years, MIN_ANNUALIZED_MAX_RETURN)
+    keep_p = _can_clear(Kp, spot + put_mid - call_mid.max(), years, MIN_ANNUALIZED_MIN_RETURN)
+    if not keep_c.any() or not keep_p.any():
+        return global_min_roi
+    Kp, put_mid = Kp[keep_p], put_mid[keep_p]
+    Kc, call_mid = Kc[keep_c], call_mid[keep_c]
+
+    # Only the accepted pairs come back, so no P×C result grid is allocated.
+    pi, ci, annualized_min_return = profitability(spot, years, Kp, put_mid, Kc, call_mid)
+    if len(annualized_min_return):
+        best = float(annualized_min_return.max())
+        if global_min_roi is None or best > global_min_roi:
+            global_min_roi = best
+        if verbose:
+            # Calls in the outer loop, as the pairs were always reported; one write
+            # for the whole listing rather than a print() per pair.
+            sys.stdout.write("".join(
+                f"call price = {call_mid[ci[k]]}, put price = {put_mid[pi[k]]}\n"
+                for k in np.lexsort((pi, ci))
+            ))
     return global_min_roi
 
 
+class LegColumns(NamedTuple):
+    """One side of a chain as parallel float arrays; missing quotes are NaN."""
+    strike: np.ndarray
+    bid: np.ndarray
+    ask: np.ndarray
+    mid: np.ndarray
+    volume: np.ndarray
+    open_interest: np.ndarray
+    last: np.ndarray
+    std_root: np.ndarray   # bool: root_symbol == underlying (not an adjusted series)
 
-def profitability(ticker, spot, call_contract, put_contract, dte, global_min_roi, verbose = False):
-    # strikes
-    Kc = float(call_contract["strike"])
-    Kp = float(put_contract["strike"])
 
-    call_mid = (float(call_contract["bid"]) + float(call_contract["ask"])) /2.0
-        
-    put_mid = (float(put_contract["bid"]) + float(put_contract["ask"])) /2.0
+_NUMERIC_FIELDS = ("strike", "bid", "ask", "mid", "volume", "open_interest", "last")
+_get_numeric = itemgetter(*_NUMERIC_FIELDS)
+_get_roots = itemgetter("root_symbol", "underlying")
 
-    net_credit = call_mid - put_mid
-    breakeven = round(spot + put_mid - call_mid,2)
-    
-    max_profit = (Kc - spot + net_credit) * 100.0
-    min_profit = -1*(spot - Kp - net_credit) * 100.0
 
-    initial_investment = (spot - net_credit) * 100.0
-        
-    min_return = round((min_profit / initial_investment) * 100,2)
-    max_return = round((max_profit / initial_investment) * 100,2)
+def _columns(contracts):
+    """Convert a list of normalized contracts into LegColumns once per side."""
+    # One C-level itemgetter call per contract; None becomes NaN in the float cast.
+    rows = np.array([_get_numeric(c) for c in contracts], dtype=np.float64)
+    cols = rows.reshape(-1, len(_NUMERIC_FIELDS)).T
+    std_root = np.fromiter(
+        (root == underlying for root, underlying in map(_get_roots, contracts)),
+        dtype=bool, count=len(contracts),
+    )
+    return LegColumns(*cols, std_root=std_root)
 
-    annualized_min_return = round(100* (((1+min_return/100) ** (365/dte))-1),2)
-    annualized_max_return = round(100* (((1+max_return/100) ** (365/dte))-1),2)
-    
 
-    reward_to_risk = -1 if min_profit == 0 else round(-1 * (max_profit) / (min_profit),1)
-    term_BE_drift = (breakeven - spot) / spot
-    annualized_BE_drift =100*((1+term_BE_drift) ** (365/dte) - 1)
+def _tradeable(legs):
+    """Two-sided, non-zero bid, spread under 35% of mid, standard (non-adjusted) root."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wide = (legs.ask - legs.bid) / legs.mid > 0.35
+    # mid is NaN exactly when bid or ask is missing, so one check covers both sides.
+    two_sided = ~np.isnan(legs.mid) & (legs.bid != 0)
+    return two_sided & ~wide & legs.std_root
 
-    
 
-    #if 1> 0:
-    if annualized_BE_drift < MAX_ANNUALIZED_BE_DRIFT and annualized_max_return > MIN_ANNUALIZED_MAX_RETURN and annualized_min_return > MIN_ANNUALIZED_MIN_RETURN and (reward_to_risk >  MIN_REWARD_TO_RISK or reward_to_risk < 0):
-        if global_min_roi is None or annualized_min_return > global_min_roi:
-            global_min_roi = annualized_min_return
-        # if 1>0:
-        #     print(f"{ticker}, {put_contract["expiration_date"]}, {round(initial_investment)}, Kp={Kp}, Kc={Kc}, max profit = {round(max_profit)}, max loss = {round(min_profit)}, Min ROI: {annualized_min_return}%, Max ROI: {annualized_max_return}%, r-to-r={reward_to_risk}, BE={breakeven}, BE_drift = {round(annualized_BE_drift,1)}%")
-        if verbose:
-            print(f"call price = {call_mid}, put price = {put_mid}")
-    return global_min_roi
+def _illiquid_call(legs):
+    # NaN volume/open interest/last compare False, so missing data never marks a leg illiquid.
+    return ((legs.volume == 0) & (legs.open_interest < 50) &
+        (legs.ask > 2 * legs.last) & (legs.ask > 5 * legs.bid)
+    )
+
+
+def _can_clear(strike, cost_floor, years, threshold):
+    """
+    False where strike / cost - 1, annualized, stays at or below threshold (%) for
+    every cost >= cost_floor. Non-positive floors are never pruned; a little slack
+    covers the rounding profitability() applies before its comparisons.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret_bound = strike / cost_floor - 1 + 1e-4
+        annualized_bound = 100* np.expm1(np.log1p(ret_bound) * years)
+    return (cost_floor <= 0) | ~(annualized_bound <= threshold - 0.01)
+
+
+def profitability(spot, years, Kp, put_mid, Kc, call_mid):
+    """
+    Score every (put, call) collar at once. Kp/put_mid have shape (P,), Kc/call_mid
+    shape (C,), strikes ascending. Returns (put_idx, call_idx, annualized_min_return)
+    for the accepted pairs only, as flat arrays in put-major order. `years` is the
+    annualizing exponent 365 / dte, computed once per expiry by the caller.
+    """
+    none = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0))
+
+    # Only pairs with the put strike below the call strike are collars. Both strike
+    # arrays are ascending, so put i pairs with the call suffix from searchsorted;
+    # the flat (put, call) index arrays are built from those bounds, row-major,
+    # without materializing a P×C comparison grid.
+    first_call = np.searchsorted(Kc, Kp, side="right")
+    n_calls = len(Kc) - first_call
+    if not n_calls.any():
+        return none
+    pi = np.repeat(np.arange(len(Kp)), n_calls)
+    ci = np.arange(len(pi)) - np.repeat(np.cumsum(n_calls) - n_calls - first_call, n_calls)
+
+    # Leg-only terms are computed once per put / per call, then paired by index:
+    #   cost (per share) = spot + put_mid - call_mid
+    #   max_profit = Kc + call_mid - spot - put_mid,  min_profit = Kp - put_mid - spot + call_mid
+    put_cost = spot + put_mid          # (P,)
+    put_floor = Kp - put_mid - spot    # (P,)
+    call_cap = Kc + call_mid - spot    # (C,)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # The max-return threshold rejects most pairs, so it is evaluated first and
+        # the remaining terms are only computed for the pairs that clear it.
+        cost = put_cost[pi] - call_mid[ci]
+        initial_investment = cost * 100.0
+        max_profit = (call_cap[ci] - put_mid[pi]) * 100.0
+        max_return = np.round((max_profit / initial_investment) * 100, 2)
+        # (1 + r) ** years - 1 as expm1(log1p(r) * years): vectorized and exact near r = 0.
+        annualized_max_return = np.round(100* np.expm1(np.log1p(max_return/100) * years),2)
+
+        keep = np.flatnonzero(annualized_max_return > MIN_ANNUALIZED_MAX_RETURN)
+        pi, ci = pi[keep], ci[keep]
+        cost, initial_investment, max_profit = cost[keep], initial_investment[keep], max_profit[keep]
+        breakeven = np.round(cost, 2)
+
+        min_profit = (put_floor[pi] + call_mid[ci]) * 100.0
+        min_return = np.round((min_profit / initial_investment) * 100, 2)
+        annualized_min_return = np.round(100* np.expm1(np.log1p(min_return/100) * years),2)
+
+        reward_to_risk = np.where(min_profit == 0, -1, np.round(-1 * (max_profit) / (min_profit),1))
+        term_BE_drift = (breakeven - spot) / spot
+        annualized_BE_drift =100* np.expm1(np.log1p(term_BE_drift) * years)
+
+    accepted = (
+        (annualized_BE_drift < MAX_ANNUALIZED_BE_DRIFT)
+        & (annualized_min_return > MIN_ANNUALIZED_MIN_RETURN)
+        & ((reward_to_risk > MIN_REWARD_TO_RISK) | (reward_to_risk < 0))
+    )
+    return pi[accepted], ci[accepted], annualized_min_return[accepted]
         
 
-async def find_valid_expirations(ticker, client):
-    unfiltered_exps = await list_expirations(ticker, client=client)
-    today =date.today()
-    six_months_later = today + relativedelta(months=5)
+async def _list_expirations_cached(ticker, client, force_refresh=False):
+    """
+    list_expirations, persisted per ticker per day under data/cache/expirations.
+    force_refresh ignores (and rewrites) today's copy.
+    """
+    path = _EXP_CACHE_DIR / f"{ticker.replace('/', '_')}_{date.today():%Y%m%d}.json"
+    if path.exists() and not force_refresh:
+        return orjson.loads(path.read_bytes())
+    exps = await list_expirations(ticker, client=client)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(orjson.dumps(exps))
+    return exps
+
+@lru_cache(maxsize=4)
+def _expiry_cutoff(today):
+    """ISO date five months out; computed once per day rather than once per ticker."""
+    return (today + relativedelta(months=5)).isoformat()
+
+async def find_valid_expirations(ticker, client, force_refresh=False):
+    unfiltered_exps = await _list_expirations_cached(ticker, client, force_refresh)
+    # list_expirations returns sorted ISO YYYY-MM-DD dates, which order correctly
+    # as strings, so the cutoff is a bisect. Each survivor is parsed once here
+    # and carried with its DTE.
+    today = date.today()
+    start = bisect_left(unfiltered_exps, _expiry_cutoff(today))
     filtered = [
-        d for d in unfiltered_exps
-        if datetime.strptime(d, "%Y-%m-%d").date() >= six_months_later
+        (d, (date.fromisoformat(d) - today).days)
+        for d in unfiltered_exps[start:]
     ]
     return filtered
 
 # Retrieve a list of exps 6 months or more in the future.
-async def find_best_leap(ticker,client, spot = None, verbose=False):
-    global_min_roi = None
+async def find_best_leap(ticker,client, spot = None, verbose=False, force_refresh=False):
     if spot == None:
         spot = await get_underlying_price(ticker, client=client)
         if spot is None:
             if verbose:
                 print(f"Can't find spot for {ticker}")
             return
-        if spot > 30:
+        if spot > MAX_SPOT:
             return
     # print(f"{ticker} spot={round(spot,2)}")
     
-    filtered = await find_valid_expirations(ticker, client)
-    for expiration_date in filtered:
-        # print(ticker, expiration_date, "...")
-        global_min_roi = await analyze(ticker, client, expiration_date, spot, global_min_roi, verbose)
-    if global_min_roi is not None:
-        print(f"{ticker}, {global_min_roi}")     
+    filtered = await find_valid_expirations(ticker, client, force_refresh)
+    if not filtered:
+        return
 
+    # Probe the nearest valid expiry and drop illiquid underlyings before fanning out.
+    # Same arguments as analyze(), so the TTL-cached chain is reused, not refetched.
+    probe = await list_chain_for_expiry(ticker, filtered[0][0], client=client, include_greeks=False, fields=LEAP_FIELDS)
+    open_interest = sum(c["open_interest"] or 0 for side in (probe.calls, probe.puts) for c in side)
+    if open_interest < MIN_PROBE_OPEN_INTEREST:
+        if verbose:
+            print(f"{ticker}: open interest too thin, skipping")
+        return
+
+    # Expirations are scored independently, so fetch and screen them concurrently
+    # and keep the best min ROI across them.
+    sem = asyncio.Semaphore(MAX_CONCURRENT_EXPIRATIONS)
+
+    async def one(expiration_date, dte):
+        async with sem:
+            return await analyze(ticker, client, expiration_date, dte, spot, None, verbose)
+
+    results = await asyncio.gather(*(one(e, d) for e, d in filtered))
+    return max((r for r in results if r is not None), default=None)
+
+
+async def screen(tickers, force_refresh=False):
+    # Tickers are independent; overlap their network waits on the shared session.
+    sem = asyncio.Semaphore(MAX_CONCURRENT_TICKERS)
+
+    async def one(ticker):
+        async with sem:
+            return await find_best_leap(ticker, client, spots[ticker], verbose=False, force_refresh=force_refresh)
 
-async def main():
     async with TradierClient(api_key=TRADIER_API_KEY) as client:
-        for ticker in nyse_arca_list:
-            await find_best_leap(ticker, client,None, verbose=False)
+        # One batched quote request per QUOTE_BATCH_SIZE tickers instead of one each;
+        # the same spot filter find_best_leap applies when it fetches spot itself.
+        spots = await get_underlying_prices(tickers, client=client)
+        tickers = [t for t in tickers if spots[t] is not None and spots[t] <= MAX_SPOT]
+        results = await asyncio.gather(*(one(t) for t in tickers), return_exceptions=True)
+
+    # Collect every hit and write the chunk's report in one go.
+    out = []
+    for ticker, result in zip(tickers, results):
+        if isinstance(result, Exception):
+            out.append(f"{ticker}: {result}")
+        elif result is not None:
+            out.append(f"{ticker}, {result}")
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
+
+
+def _screen_chunk(tickers, force_refresh):
+    """ProcessPoolExecutor entry point: one event loop and HTTP session per worker."""
+    asyncio.run(screen(tickers, force_refresh))
+
+
+def main():
+    # --refresh refetches expiration lists instead of reading today's disk cache.
+    force_refresh = "--refresh" in sys.argv[1:]
+    # Scoring is CPU work under the GIL, so the universe is split across processes
+    # rather than only interleaved on one loop. Striding keeps the chunks balanced.
+    chunks = [nyse_arca_list[i::SCREEN_WORKERS] for i in range(SCREEN_WORKERS)]
+    with ProcessPoolExecutor(max_workers=SCREEN_WORKERS) as pool:
+        list(pool.map(_screen_chunk, chunks, repeat(force_refresh)))
    
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
 
 
 # if __name__ == "__main__":
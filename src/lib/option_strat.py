@@ -1,11 +1,16 @@
+import numpy as np
 import pandas as pd
 import awswrangler as wr
+import boto3
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Iterable, Optional
 from lib.constants import CONTRACT_MULTIPLIER, WEEKDAY_ALIASES
-from lib.athena_lib import athena, query_entries_range_for_leg, fetch_expiry_quotes, fetch_quotes_at_exit, query_ticker, fetch_put_spread_trades
+from lib.athena_lib import athena, leg_entries_sql, query_entries_range_for_leg, fetch_expiry_quotes, fetch_quotes_at_exit, query_ticker, fetch_put_spread_trades
 from lib.data import Leg
 
+LEG_QUERY_WORKERS = 8   # threads running per-leg Athena queries; each mostly waits on Athena
+
 
 def retrieve_study_data(ts_start: str,
     ts_end: str,ticker:str, entry_weekdays:Optional[Iterable] = None):
@@ -54,27 +59,46 @@ def query_entries_range_for_strategy(
     mode: str = "nearest",
     require_all_legs: bool = True,
     entry_weekdays: Optional[Iterable] = None,  # NEW: e.g., {"WED"} or {2}
+    verbose: bool = True,
 ) -> pd.DataFrame:
     """
     Resolve each leg to a concrete contract per day in [ts_start, ts_end).
     If require_all_legs=True, keep only entry_dates present for ALL legs.
     If entry_weekdays is provided, keep only those weekdays (0=Mon..6=Sun or {'WED'}).
+    If verbose, print each leg's SQL and result frame, in leg order.
     """
-    per_leg = []
-    for idx, leg in enumerate(strategy.legs):
-        df_leg = query_entries_range_for_leg(
+    def _query_leg(leg):
+        # boto3's default session is not thread-safe, so each worker gets its own.
+        return query_entries_range_for_leg(
             ts_start=ts_start,
             ts_end=ts_end,
             ticker=ticker,
             leg=leg,
             mode=mode,
-        ).copy()
+            boto3_session=boto3.Session(),
+            verbose=False,
+        )
+
+    # The legs' queries are independent, so run them side by side; map keeps leg order.
+    leg_frames = []
+    if strategy.legs:
+        with ThreadPoolExecutor(max_workers=min(LEG_QUERY_WORKERS, len(strategy.legs))) as ex:
+            leg_frames = list(ex.map(_query_leg, strategy.legs))
+
+    per_leg = []
+    for idx, (leg, df_leg) in enumerate(zip(strategy.legs, leg_frames)):
+        if verbose:
+            # Printed here, in leg order, rather than from the worker threads.
+            print(leg_entries_sql(ts_start, ts_end, ticker, leg, mode))
+            print(df_leg)
+        df_leg = df_leg.copy()
         df_leg["leg_index"]     = idx
         df_leg["leg_direction"] = leg.direction.name
+        df_leg["leg_sign"]      = np.int8(1 if leg.direction.name == "BUY" else -1)
         df_leg["leg_type"]      = leg.opt_type.name
-        df_leg["leg_quantity"]  = leg.quantity
+        df_leg["leg_quantity"]  = np.int32(leg.quantity)
         df_leg["target_delta"]  = float(leg.strike_delta) / 100.0
-        df_leg["target_dte"]    = int(leg.dte)
+        df_leg["target_dte"]    = np.int16(leg.dte)
         per_leg.append(df_leg)
 
     if not per_leg:
@@ -137,6 +161,8 @@ def summarize_exit_on_earliest_expiry(tidy_entries: pd.DataFrame) -> pd.DataFram
     work = attach_exit_date_min_expiry(tidy_entries)
     if "row_id" not in work.columns:
         work["row_id"] = range(len(work))
+    if "leg_sign" not in work.columns:
+        work["leg_sign"] = work["leg_direction"].map({"BUY": 1, "SELL": -1}).astype(np.int8)
 
     # Get exit-day quotes for every leg
     exitq = fetch_quotes_at_exit(work[[
@@ -145,20 +171,22 @@ def summarize_exit_on_earliest_expiry(tidy_entries: pd.DataFrame) -> pd.DataFram
 
     # Join back leg metadata (one-to-one on row_id after dedup)
     merged = exitq.merge(
-        work[["row_id","entry_date","exit_date","leg_index","leg_direction","leg_type","leg_quantity","entry_last"]],
+        work[["row_id","entry_date","exit_date","leg_index","leg_direction","leg_sign","leg_type","leg_quantity","entry_last"]],
         on=["row_id","entry_date","exit_date","entry_last"],
         how="left",
         validate="one_to_one"
     )
 
+    # Signed contracts per leg (+BUY / -SELL); the products below run on plain
+    # arrays, so no intermediate Series or index alignment per operator.
+    signed_qty = merged["leg_sign"].to_numpy() * merged["leg_quantity"].to_numpy()
+    entry_last = merged["entry_last"].to_numpy(dtype=float)
+
     # Per-leg PnL at exit (signed by BUY/SELL)
-    sign = merged["leg_direction"].map({"BUY": 1, "SELL": -1}).astype(int)
-    merged["leg_pnl"] = (merged["quote_last"] - merged["entry_last"]) * CONTRACT_MULTIPLIER * sign * merged["leg_quantity"]
+    merged["leg_pnl"] = (merged["quote_last"].to_numpy(dtype=float) - entry_last) * CONTRACT_MULTIPLIER * signed_qty
 
     # Signed entry premium (cash outlay at entry)
-    merged["entry_premium_signed"] = (
-        merged["entry_last"] * CONTRACT_MULTIPLIER * merged["leg_quantity"] * sign
-    )
+    merged["entry_premium_signed"] = entry_last * CONTRACT_MULTIPLIER * signed_qty
 
     # Aggregate to portfolio per entry_date + exit_date
     summary = (
@@ -213,6 +241,8 @@ def summarize_hold_to_maturity_strategy_from_entries(tidy_entries: pd.DataFrame)
     work = tidy_entries.copy()
     if "row_id" not in work.columns:
         work["row_id"] = range(len(work))
+    if "leg_sign" not in work.columns:
+        work["leg_sign"] = work["leg_direction"].map({"BUY": 1, "SELL": -1}).astype(np.int8)
 
     # Pull expiry quotes (one row per row_id)
     expq = fetch_expiry_quotes(work[[
@@ -221,126 +251,51 @@ def summarize_hold_to_maturity_strategy_from_entries(tidy_entries: pd.DataFrame)
 
     # Merge leg metadata (include strike/expiry to keep merge one-to-one)
     merged = expq.merge(
-        work[["row_id","entry_date","expiry","strike","leg_index","leg_direction","leg_type","leg_quantity","entry_last"]],
+        work[["row_id","entry_date","expiry","strike","leg_index","leg_direction","leg_sign","leg_type","leg_quantity","entry_last"]],
         on=["row_id","entry_date","expiry","strike","entry_last"],
         how="left",
         validate="one_to_one"
     )
 
+    # Signed contracts per leg (+BUY / -SELL), shared by both products below
+    signed_qty = merged["leg_sign"].to_numpy() * merged["leg_quantity"].to_numpy()
+
     # Per-leg PnL at expiry (NOTE: profit already includes *100*)
-    sign = merged["leg_direction"].map({"BUY": 1, "SELL": -1}).astype(int)
-    merged["leg_pnl"] = merged["profit"] * sign * merged["leg_quantity"]
+    merged["leg_pnl"] = merged["profit"].to_numpy(dtype=float) * signed_qty
 
     # Signed entry premium (already *100*)
-    merged["entry_premium_signed"] = (
-        merged["entry_last"] * CONTRACT_MULTIPLIER * merged["leg_quantity"] * sign
-    )
+    merged["entry_premium_signed"] = merged["entry_last"].to_numpy(dtype=float) * CONTRACT_MULTIPLIER * signed_qty
     print("merged")
     print(merged)
-    # ---- EARLY FILTER: drop groups with net_entry_premium ≈ 0 or NaN ----
-    EPS = 1e-9
-    nep_by_group = (
-        merged.groupby(["entry_date","expiry"], as_index=False)["entry_premium_signed"]
-              .sum()
-              .rename(columns={"entry_premium_signed": "net_entry_premium"})
-    )
-    nep_by_group = nep_by_group[nep_by_group["net_entry_premium"].notna()]
-    nep_by_group = nep_by_group[nep_by_group["net_entry_premium"].abs() > EPS]
-
-    # Keep only allowed keys in merged
-    if nep_by_group.empty:
-        return {"roc": float(0.0), "win_rate": float(0.0)}
-
-    allowed = set(map(tuple, nep_by_group[["entry_date","expiry"]].itertuples(index=False, name=None)))
-    merged = merged[merged.apply(lambda r: (r["entry_date"], r["expiry"]) in allowed, axis=1)].copy()
-    if merged.empty:
-        return {"roc": float(0.0), "win_rate": float(0.0)}
-
-    # Build summary core and attach filtered net_entry_premium
-    summary_core = (
+    # One pass over (entry_date, expiry) builds every per-group aggregate
+    summary = (
         merged.groupby(["entry_date","expiry"], as_index=False)
               .agg(
                   legs=("leg_index","nunique"),
                   total_contracts=("leg_quantity","sum"),
                   portfolio_pnl=("leg_pnl","sum"),
+                  net_entry_premium=("entry_premium_signed","sum"),
               )
-              .sort_values(["entry_date","expiry"])
     )
-    summary = summary_core.merge(nep_by_group, on=["entry_date","expiry"], how="left", validate="one_to_one")
+
+    # ---- Drop groups with net_entry_premium ≈ 0 or NaN ----
+    EPS = 1e-9
+    summary = summary[summary["net_entry_premium"].notna() & (summary["net_entry_premium"].abs() > EPS)]
+    if summary.empty:
+        return {"roc": float(0.0), "win_rate": float(0.0)}
+    summary = summary.reset_index(drop=True)
     print(summary.head())
 
     # roc_like_metric: PnL / (-net_entry_premium) (safe)
-    def _safe_roc_like(pnl, nep):
-        if pd.isna(nep) or abs(nep) <= EPS:
-            return pd.NA
-        return float(pnl) / float(-nep)
-
-    summary["roc_like_metric"] = [ _safe_roc_like(p, n) for p, n in zip(summary["portfolio_pnl"], summary["net_entry_premium"]) ]
+    nep = summary["net_entry_premium"].to_numpy(dtype=float)
+    ok = ~np.isnan(nep) & (np.abs(nep) > EPS)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        summary["roc_like_metric"] = np.where(ok, summary["portfolio_pnl"].to_numpy(dtype=float) / -nep, np.nan)
     print("summary 2")
     print(summary.head())
 
     # ----- Capital (condor max loss) computed from group data -----
-    def _compute_condor_capital_for_group(group: pd.DataFrame) -> float:
-        sc = group[(group["leg_type"] == "CALL") & (group["leg_direction"] == "SELL")]
-        lc = group[(group["leg_type"] == "CALL") & (group["leg_direction"] == "BUY")]
-        sp = group[(group["leg_type"] == "PUT")  & (group["leg_direction"] == "SELL")]
-        lp = group[(group["leg_type"] == "PUT")  & (group["leg_direction"] == "BUY")]
-        # Strangle/straddle: short legs only, no long legs
-        if lc.empty and lp.empty and (not sc.empty or not sp.empty):
-            sc_strike = float(sc.iloc[0]["strike"]) if not sc.empty else None
-            sp_strike = float(sp.iloc[0]["strike"]) if not sp.empty else None
-            strikes = [s for s in [sc_strike, sp_strike] if s is not None]
-            underlying_est = sum(strikes) / len(strikes)
-
-            call_margin = 0.0
-            if not sc.empty:
-                sc_qty = int(sc.iloc[0]["leg_quantity"])
-                call_credit = float(-sc.iloc[0]["entry_premium_signed"])
-                call_otm = max(0.0, sc_strike - underlying_est) * CONTRACT_MULTIPLIER * sc_qty
-                method1 = 0.20 * underlying_est * CONTRACT_MULTIPLIER * sc_qty - call_otm + call_credit
-                method2 = 0.10 * underlying_est * CONTRACT_MULTIPLIER * sc_qty + call_credit
-                call_margin = max(method1, method2)
-
-            put_margin = 0.0
-            if not sp.empty:
-                sp_qty = int(sp.iloc[0]["leg_quantity"])
-                put_credit = float(-sp.iloc[0]["entry_premium_signed"])
-                put_otm = max(0.0, underlying_est - sp_strike) * CONTRACT_MULTIPLIER * sp_qty
-                method1 = 0.20 * underlying_est * CONTRACT_MULTIPLIER * sp_qty - put_otm + put_credit
-                method2 = 0.10 * sp_strike * CONTRACT_MULTIPLIER * sp_qty + put_credit
-                put_margin = max(method1, method2)
-
-            return max(call_margin, put_margin)
-
-        if sc.empty or lc.empty or sp.empty or lp.empty:
-            return float("nan")
-
-        sc_strike = float(sc.iloc[0]["strike"]); lc_strike = float(lc.iloc[0]["strike"])
-        sp_strike = float(sp.iloc[0]["strike"]); lp_strike = float(lp.iloc[0]["strike"])
-
-        width_call = max(0.0, lc_strike - sc_strike)
-        width_put  = max(0.0, sp_strike - lp_strike)
-        if width_call == 0.0 and width_put == 0.0:
-            return float("nan")
-
-        sc_qty = int(sc.iloc[0]["leg_quantity"]); lc_qty = int(lc.iloc[0]["leg_quantity"])
-        sp_qty = int(sp.iloc[0]["leg_quantity"]); lp_qty = int(lp.iloc[0]["leg_quantity"])
-        spreads_count = min(sc_qty, lc_qty, sp_qty, lp_qty)
-        if spreads_count <= 0:
-            return float("nan")
-
-        net_entry_premium_total = float(group["entry_premium_signed"].sum())  # signed, *100*
-        credit_total = -net_entry_premium_total  # positive for credit
-
-        max_wing_total = max(width_call, width_put) * CONTRACT_MULTIPLIER * spreads_count
-        capital_total = max_wing_total - credit_total
-        return max(capital_total, 0.0)
-
-    cap_df = (merged.groupby(["entry_date","expiry"])
-                    .apply(_compute_condor_capital_for_group)
-                    .reset_index(name="capital"))
-
-    summary = summary.merge(cap_df, on=["entry_date","expiry"], how="left", validate="one_to_one")
+    summary["capital"] = _condor_capital_by_group(merged, summary)
     print("summary 3")
     print(summary)
     output_df_csv = pd.DataFrame(summary, columns=["entry_date", "expiry", "portfolio_pnl", "net_entry_premium", "roc_like_metric", "capital" ])
@@ -349,13 +304,15 @@ def summarize_hold_to_maturity_strategy_from_entries(tidy_entries: pd.DataFrame)
     output_df_csv.rename(columns={"roc_like_metric": "return_on_credit"}, inplace=True)
     output_df_csv["return_on_credit"] = output_df_csv["return_on_credit"].round(4)
     output_df_csv["capital"] = output_df_csv["capital"].round(2)
-    # roc on capital (safe)
+    # roc on capital (safe): NaN where capital is missing or zero
     def _safe_div(a, b):
-        if pd.isna(b) or b == 0:
-            return pd.NA
-        return float(a) / float(b)
+        a = a.to_numpy(dtype=float)
+        b = b.to_numpy(dtype=float)
+        ok = ~np.isnan(b) & (b != 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(ok, a / b, np.nan)
 
-    summary["roc"] = [_safe_div(p, c) for p, c in zip(summary["portfolio_pnl"], summary["capital"])]
+    summary["roc"] = _safe_div(summary["portfolio_pnl"], summary["capital"])
 
     # ---- Portfolio-level metrics ----
     n_entries = len(summary)
@@ -377,7 +334,7 @@ def summarize_hold_to_maturity_strategy_from_entries(tidy_entries: pd.DataFrame)
     print(f"Total Portfolio PnL: {round(total_pnl)}")
     print(f"Win rate: {round(win_rate*100,1)}%")
 
-    output_df_csv["roc"] = pd.Series([_safe_div(p, c) for p, c in zip(output_df_csv["portfolio_pnl"], output_df_csv["capital"])]).round(4)
+    output_df_csv["roc"] = np.round(_safe_div(output_df_csv["portfolio_pnl"], output_df_csv["capital"]), 4)
 
     return {
         "roc": float(round(roc, 3)),
@@ -386,6 +343,69 @@ def summarize_hold_to_maturity_strategy_from_entries(tidy_entries: pd.DataFrame)
     }, output_df_csv
 
 
+def _pymax(a, b):
+    """Elementwise max(a, b) exactly as the builtin evaluates it (b only if b > a), NaNs included."""
+    return np.where(b > a, b, a)
+
+
+def _condor_capital_by_group(merged: pd.DataFrame, summary: pd.DataFrame) -> np.ndarray:
+    """
+    Capital for each (entry_date, expiry) row of summary, for every group at once.
+    Short-only groups (strangle/straddle) use the naked-option margin estimate;
+    four-leg groups use condor max loss (widest wing * spreads - credit).
+    Anything else, or zero-width wings / no spreads, is NaN. Each leg role
+    (short call, long call, short put, long put) takes its first row in the group.
+    """
+    keys = ["entry_date","expiry"]
+    groups = pd.MultiIndex.from_frame(summary[keys])
+
+    def _leg(opt_type, direction):
+        rows = merged[(merged["leg_type"] == opt_type) & (merged["leg_direction"] == direction)]
+        rows = rows.drop_duplicates(subset=keys, keep="first").set_index(keys)
+        present = groups.isin(rows.index)
+        rows = rows.reindex(groups)
+        return (present,
+                rows["strike"].to_numpy(dtype=float),
+                rows["leg_quantity"].to_numpy(dtype=float),
+                -rows["entry_premium_signed"].to_numpy(dtype=float))   # credit, positive
+
+    has_sc, sc_strike, sc_qty, call_credit = _leg("CALL", "SELL")
+    has_lc, lc_strike, lc_qty, _           = _leg("CALL", "BUY")
+    has_sp, sp_strike, sp_qty, put_credit  = _leg("PUT",  "SELL")
+    has_lp, lp_strike, lp_qty, _           = _leg("PUT",  "BUY")
+
+    with np.errstate(invalid="ignore"):
+        # Strangle/straddle: short legs only, no long legs
+        underlying_est = np.where(has_sc & has_sp, (sc_strike + sp_strike) / 2,
+                                  np.where(has_sc, sc_strike, sp_strike))
+
+        call_otm = _pymax(0.0, sc_strike - underlying_est) * CONTRACT_MULTIPLIER * sc_qty
+        method1 = 0.20 * underlying_est * CONTRACT_MULTIPLIER * sc_qty - call_otm + call_credit
+        method2 = 0.10 * underlying_est * CONTRACT_MULTIPLIER * sc_qty + call_credit
+        call_margin = np.where(has_sc, _pymax(method1, method2), 0.0)
+
+        put_otm = _pymax(0.0, underlying_est - sp_strike) * CONTRACT_MULTIPLIER * sp_qty
+        method1 = 0.20 * underlying_est * CONTRACT_MULTIPLIER * sp_qty - put_otm + put_credit
+        method2 = 0.10 * sp_strike * CONTRACT_MULTIPLIER * sp_qty + put_credit
+        put_margin = np.where(has_sp, _pymax(method1, method2), 0.0)
+
+        naked = ~has_lc & ~has_lp & (has_sc | has_sp)
+
+        # Condor: all four legs
+        width_call = _pymax(0.0, lc_strike - sc_strike)
+        width_put  = _pymax(0.0, sp_strike - lp_strike)
+        spreads_count = np.minimum.reduce([np.trunc(q) for q in (sc_qty, lc_qty, sp_qty, lp_qty)])
+        credit_total = -summary["net_entry_premium"].to_numpy(dtype=float)   # positive for credit
+        max_wing_total = _pymax(width_call, width_put) * CONTRACT_MULTIPLIER * spreads_count
+        condor_capital = _pymax(max_wing_total - credit_total, 0.0)
+        condor = (has_sc & has_lc & has_sp & has_lp
+                  & ~((width_call == 0.0) & (width_put == 0.0))
+                  & (spreads_count > 0))
+
+    return np.where(naked, _pymax(call_margin, put_margin),
+                    np.where(condor, condor_capital, np.nan))
+
+
 def summarize_put_spread_trades(df: pd.DataFrame, pricing: str = "mid") -> tuple:
     """
     Compute PnL, capital, and summary metrics from fetch_put_spread_trades() output.
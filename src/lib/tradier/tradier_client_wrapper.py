@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 import aiohttp
+import orjson
 
 
 @dataclass
@@ -49,4 +50,6 @@ class TradierClient:
         url = f"{self.endpoint}{path}"
         async with self.session.get(url, params=params) as resp:
             resp.raise_for_status()
-            return await resp.json()
+            # Chain responses run to hundreds of KB; orjson decodes them several
+            # times faster than the stdlib json that resp.json() uses.
+            return orjson.loads(await resp.read())
@@ -30,10 +30,10 @@ else:
 print(f"Date range: {from_date} → {to_date}\n")
 
 # ── Fetch ─────────────────────────────────────────────────────────────────────
-xml_text = fetch_flex_query(from_date=from_date, to_date=to_date)
+xml_data = fetch_flex_query(from_date=from_date, to_date=to_date)
 
 # ── Parse ─────────────────────────────────────────────────────────────────────
-dfs = parse_flex_xml(xml_text)
+dfs = parse_flex_xml(xml_data)
 print(f"\nParsed sections: {list(dfs.keys())}")
 
 # ── Upsert ────────────────────────────────────────────────────────────────────
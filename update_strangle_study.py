@@ -17,7 +17,7 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
-from lib.mysql_lib import get_study_tickers, recompute_summary_from_detail
+from lib.mysql_lib import get_study_tickers, recompute_summary_from_detail, create_study_detail_indexes
 from lib.condor_tools import strangle_study
 
 
@@ -27,6 +27,8 @@ def main():
     parser.add_argument("--ts-end",   default="2026-03-16", help="End date YYYY-MM-DD")
     args = parser.parse_args()
 
+    create_study_detail_indexes()
+
     print("Fetching tickers from MySQL summary table...")
     tickers = get_study_tickers()
     print(f"  {len(tickers)} tickers found\n")